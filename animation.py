@@ -0,0 +1,70 @@
+from collections import namedtuple
+import pygame
+
+
+# One precomputed animation frame; rect is the image's rect at the origin
+AnimationFrame = namedtuple('AnimationFrame', ['image', 'mask', 'rect'])
+
+
+class Animation:
+    """
+    A sequence of frames with their masks and rects computed once at load, shown frame_time seconds each.
+    """
+
+    def __init__(self, images, frame_time=0, loop=True):
+        self.frames = [AnimationFrame(image, pygame.mask.from_surface(image), image.get_frect())
+                       for image in images]
+        self.frame_time = frame_time
+        self.loop = loop
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class AnimationClock:
+    """
+    Table-driven animation clock: accumulates time and steps through an Animation's frames by index.
+    Starting at index -1 means no frame of the animation is shown until the first step.
+    """
+
+    def __init__(self, animation, index=0):
+        self.animation = animation
+        self.index = index
+        self.timer = 0
+
+    def advance(self, dt):
+        """Add dt and step to the next frame once frame_time has passed. Returns True if it stepped."""
+        self.timer += dt
+        if self.timer < self.animation.frame_time:
+            return False
+        self.timer = 0
+        self.index += 1
+        if self.animation.loop:
+            self.index %= len(self.animation)
+        return True
+
+    @property
+    def frame(self):
+        """The AnimationFrame at the current index."""
+        return self.animation.frames[self.index]
+
+    @property
+    def on_last_frame(self):
+        return self.index >= len(self.animation) - 1
+
+    @property
+    def finished(self):
+        """True once a non-looping animation has stepped past its last frame."""
+        return not self.animation.loop and self.index >= len(self.animation)
+
+
+def build_animations(image_dict):
+    """
+    Returns the game's animations, built once from the converted images.
+    """
+    spaceship = image_dict['spaceship']
+    return {
+        'ship_idle': Animation(spaceship[:1]),
+        'ship_flying': Animation(spaceship[1:], frame_time=0.2),
+        'explosion': Animation(image_dict['explosions'], frame_time=0.1, loop=False),
+    }
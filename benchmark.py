@@ -0,0 +1,203 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from game_classes import GameState
+from simulation import SimulationClock
+from input_sources import ScriptedInput
+
+
+# name: (gameplay running, wave active, asteroid population kept on screen)
+SCENARIOS = {
+    'idle': (False, False, 0),
+    'normal': (True, False, 4),
+    'wave': (True, True, 12),
+    'stress': (True, True, 300),
+}
+
+DEFAULT_BASELINE = 'bench_baseline.json'
+ALLOC_SLACK = 256  # Bytes per frame allowed on top of the tolerance, so near-zero baselines are not flaky
+
+
+def make_game(seed, entity_store=False):
+    """Creates a headless game ready to play, with a scripted input source."""
+    from game import Game
+
+    clock = SimulationClock()
+    game = Game(headless=True, seed=seed, clock=clock,
+                input_source=ScriptedInput(clock), entity_store=entity_store)
+    game.begin_play()
+    return game
+
+
+def prepare_frame(game, scenario):
+    """Advances the clock and holds the scenario's sprite population and wave state steady."""
+    playing, wave_active, population = SCENARIOS[scenario]
+    game.time.advance()
+    game.dt = game.time.step
+    game.game_state = GameState.PLAYING if playing else GameState.LOADING
+    game.wave_active = wave_active
+    game.last_wave_time = game.time()
+    game.player.health = game.player.max_health
+    while len(game.asteroids) < population:
+        asteroid = game.create_asteroid()
+        # pos is the asteroid's center, the same convention as the entity store
+        asteroid.pos.y = game.rng.uniform(-50, game.SCREEN_HEIGHT)
+        if asteroid.slot is not None:
+            game.entity_store.pos[asteroid.slot, 1] = game.entity_store.prev_pos[asteroid.slot, 1] = asteroid.pos.y
+
+
+def stages(game):
+    """Returns the hot paths to measure, each as a callable running one frame's worth of work."""
+    def asteroid_update():
+        if game.entity_store is not None:
+            for slot in game.entity_store.step(game.dt, game.SCREEN_HEIGHT, game.ROTATION_STEP):
+                game.entity_store.sprites[slot].kill()
+        else:
+            for asteroid in game.asteroids.sprites():
+                asteroid.update()
+
+    def player_move():
+        game.player.move_player(
+            game.rng.randint(0, game.SCREEN_WIDTH), game.rng.randint(0, game.SCREEN_HEIGHT))
+
+    def ui_health_bar():
+        game.ui.update_health_bar(game.rng.randint(0, 100))
+
+    def alert_text():
+        game.alert_text = 'wave incoming!'
+        game.draw_alert_text()
+
+    def frame():
+        game.update_hand_position()
+        game.update_game_elements(game.time.step)
+
+    return {
+        'update_game_elements': frame,
+        'asteroid_update': asteroid_update,
+        'player_move': player_move,
+        'ui_health_bar': ui_health_bar,
+        'alert_text': alert_text,
+    }
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenario(scenario, frames, seed, entity_store=False):
+    """Measures every stage of a scenario and returns its per-stage results."""
+    game = make_game(seed, entity_store)
+    results = {}
+    for name, stage in stages(game).items():
+        # Warm up caches before timing
+        for _ in range(min(frames, 30)):
+            prepare_frame(game, scenario)
+            stage()
+
+        timings = []
+        for _ in range(frames):
+            prepare_frame(game, scenario)
+            start = time.perf_counter()
+            stage()
+            timings.append((time.perf_counter() - start) * 1e6)
+
+        # Allocation pass, kept separate so tracing does not skew the timings
+        alloc_frames = max(1, frames // 10)
+        tracemalloc.start()
+        allocated = 0
+        for _ in range(alloc_frames):
+            prepare_frame(game, scenario)
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            stage()
+            _, peak = tracemalloc.get_traced_memory()
+            allocated += peak - before
+        tracemalloc.stop()
+
+        mean = sum(timings) / len(timings)
+        results[name] = {
+            'mean_us': round(mean, 2),
+            'p95_us': round(percentile(timings, 0.95), 2),
+            'fps': round(1e6 / mean, 1) if mean else None,
+            'alloc_bytes_per_frame': allocated // alloc_frames,
+        }
+    game.stop_hand_tracking()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a list of regressions where a stage's mean time or allocations per frame exceed
+    the baseline by more than tolerance.
+    """
+    regressions = []
+    for scenario, scenario_results in results.items():
+        for stage, stage_results in scenario_results.items():
+            reference = baseline.get(scenario, {}).get(stage)
+            if not reference:
+                continue
+            if stage_results['mean_us'] > reference['mean_us'] * (1 + tolerance):
+                regressions.append(
+                    f"{scenario}/{stage}: {stage_results['mean_us']}us vs baseline {reference['mean_us']}us")
+            allocated = stage_results['alloc_bytes_per_frame']
+            if allocated > reference.get('alloc_bytes_per_frame', allocated) * (1 + tolerance) + ALLOC_SLACK:
+                regressions.append(
+                    f"{scenario}/{stage}: {allocated}B/frame vs baseline {reference['alloc_bytes_per_frame']}B/frame")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the astroDodger gameplay hot paths.')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scenario', choices=SCENARIOS,
+                        action='append', help='Scenario to run (default: all).')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline JSON file to compare against.')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write the results to the baseline file instead of comparing.')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed rise in time or allocations before a stage counts as a regression.')
+    parser.add_argument('--output', help='Also write the results to this JSON file.')
+    parser.add_argument('--entity-store', action='store_true',
+                        help='Use the vectorized NumPy entity store for asteroids and shields.')
+    args = parser.parse_args()
+
+    results = {}
+    for scenario in args.scenario or SCENARIOS:
+        results[scenario] = run_scenario(
+            scenario, args.frames, args.seed, args.entity_store)
+        for stage, stage_results in results[scenario].items():
+            print(f"{scenario:>7} {stage:<22} {stage_results['mean_us']:>10.1f}us "
+                  f"p95 {stage_results['p95_us']:>10.1f}us {stage_results['fps']:>10.1f}fps "
+                  f"{stage_results['alloc_bytes_per_frame']:>8}B/frame")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import math
+import pygame
+
+
+def bounding_radius(sprite):
+    """Returns the radius of the circle enclosing the sprite's rect."""
+    return getattr(sprite, 'radius', None) or math.hypot(sprite.rect.width, sprite.rect.height) / 2
+
+
+# Fraction of the enclosing circles used when circles replace the mask test (roughly the inscribed circles)
+CIRCLE_ONLY_RATIO = 0.7
+
+
+def collide_circle(sprite_a, sprite_b, ratio=1.0):
+    """Cheap bounding-circle test used before the per-pixel mask test."""
+    dx = sprite_a.rect.centerx - sprite_b.rect.centerx
+    dy = sprite_a.rect.centery - sprite_b.rect.centery
+    radius = (bounding_radius(sprite_a) + bounding_radius(sprite_b)) * ratio
+    return dx * dx + dy * dy <= radius * radius
+
+
+def collide(sprite_a, sprite_b, precise=True):
+    """
+    Bounding-circle pre-check followed by a mask overlap test for real candidates.
+    With precise=False the mask test is skipped and tighter circles are used instead.
+    """
+    if not precise:
+        return collide_circle(sprite_a, sprite_b, CIRCLE_ONLY_RATIO)
+    if not collide_circle(sprite_a, sprite_b):
+        return None
+    return pygame.sprite.collide_mask(sprite_a, sprite_b)
+
+
+class CollisionGroup(pygame.sprite.Group):
+    """
+    Group that keeps its sprites and their rects in two index-aligned lists, in the group's order,
+    so spritecollide() can hand the rects to Rect.collidelistall in one call.
+    Members must move their rect in place rather than assign a new one while in the group.
+    """
+
+    def __init__(self, *sprites):
+        self.sprite_list = []
+        self.rect_list = []
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.sprite_list.append(sprite)
+        self.rect_list.append(sprite.rect)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        index = self.sprite_list.index(sprite)
+        del self.sprite_list[index]
+        del self.rect_list[index]
+
+
+def spritecollide(sprite, group, dokill, precise=True):
+    """
+    Faster version of pygame.sprite.spritecollide using collide().
+    The rect overlap test over the whole group runs in C (Rect.collidelistall on a CollisionGroup's
+    rect list), so Python only visits sprites touching the player's rect for the circle and mask tests.
+    """
+    sprites = group.sprite_list
+    collided = [sprites[index] for index in sprite.rect.collidelistall(group.rect_list)
+                if collide(sprite, sprites[index], precise)]
+    if dokill:
+        for candidate in collided:
+            candidate.kill()
+    return collided
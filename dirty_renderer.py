@@ -0,0 +1,75 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """
+    Optional renderer that only redraws and presents the screen regions that changed since the last frame.
+    Regions drawn last frame are restored from the background before drawing, and both old and new regions
+    are presented with pygame.display.update(rects).
+
+    The background scrolls in steps of bg_step pixels. Only frames where the snapped scroll offset changes
+    need a full redraw, so a step of 8 at a scroll speed of 100 px/s redraws the whole screen about 12 times
+    per second instead of every frame. A bg_step of 0 freezes the background.
+    """
+
+    def __init__(self, screen, bg, bg_step=8):
+        self.screen = screen
+        self.bg = bg
+        self.bg_height = bg.get_height()
+        self.bg_step = bg_step
+        self.drawn_scroll = None
+        self.full_redraw = True
+        self.previous_rects = []
+        self.current_rects = []
+
+    def invalidate(self):
+        """Force a full redraw on the next frame, e.g. after a menu drew over the whole screen."""
+        self.full_redraw = True
+
+    def begin_frame(self, scroll):
+        """Redraw the whole background if its snapped offset moved, otherwise erase last frame's regions."""
+        if self.bg_step:
+            snapped = int(scroll - scroll % self.bg_step)
+        else:
+            snapped = self.drawn_scroll if self.drawn_scroll is not None else int(scroll)
+
+        if self.full_redraw or snapped != self.drawn_scroll:
+            self.drawn_scroll = snapped
+            self.full_redraw = True
+            self.draw_background(self.screen.get_rect())
+        else:
+            for rect in self.previous_rects:
+                self.draw_background(rect)
+        self.current_rects = []
+
+    def draw_background(self, rect):
+        """Draw the background at the snapped scroll offset, clipped to a screen region."""
+        self.screen.set_clip(rect)
+        self.screen.blit(self.bg, (0, self.drawn_scroll))
+        self.screen.blit(self.bg, (0, self.drawn_scroll - self.bg_height))
+        self.screen.set_clip(None)
+
+    def blit(self, image, dest, area=None):
+        """Blit onto the screen and remember the affected region."""
+        rect = self.screen.blit(image, dest, area)
+        self.current_rects.append(rect)
+        return rect
+
+    def blits(self, sequence):
+        """Blit (image, dest) pairs onto the screen in one call and remember the affected regions."""
+        rects = self.screen.blits(sequence)
+        self.current_rects.extend(rects)
+        return rects
+
+    def mark(self, rects):
+        """Remember regions drawn directly onto the screen."""
+        self.current_rects.extend(rects)
+
+    def present(self):
+        """Present the whole screen after a full redraw, otherwise only the old and new dirty regions."""
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous_rects + self.current_rects)
+        self.previous_rects = self.current_rects
+        self.full_redraw = False
@@ -0,0 +1,177 @@
+import pygame
+from collisions import CIRCLE_ONLY_RATIO, bounding_radius
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class EntityStore:
+    """
+    Optional struct-of-arrays storage for asteroid and shield kinematics.
+    Positions (sprite centers), velocities, rotation angles, spin rates, kinds, bounding radii and half heights
+    live in contiguous NumPy arrays. One vectorized step advances every entity, picks its animation frame
+    and finds the ones to cull, and draw() blits every entity straight from the arrays in one Surface.blits call.
+    Store sprites stay out of the game's all_sprites group: they are never updated or drawn one by one,
+    and only the few collision candidates get their image, mask and rect placed (see place()).
+    The math and rounding match the sprite path exactly, so runs with and without the store give the
+    same results for the same seed.
+
+    Frames are (image, mask, rect centered on (0, 0)) tuples registered per image key with add_frames();
+    an entity shows frame number round(angle / angle_step) of its key, like RotationCache.
+    """
+
+    ASTEROID = 0
+    SHIELD = 1
+
+    def __init__(self, capacity=256):
+        if np is None:
+            raise ImportError("EntityStore requires numpy (pip install numpy).")
+        self.capacity = 0
+        self.pos = np.zeros((0, 2))
+        self.prev_pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.angle = np.zeros(0)
+        self.spin = np.zeros(0)
+        self.radius = np.zeros(0)
+        self.half_height = np.zeros(0)
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.active = np.zeros(0, dtype=bool)
+        self.frame_base = np.zeros(0, dtype=np.intp)
+        self.frame = np.zeros(0, dtype=np.intp)
+        self.sprites = []
+        self.free_slots = []
+        self.step_buffer = np.zeros((0, 2))
+        self.frames = []
+        self.render_images = []
+        self.frame_offsets = np.zeros((0, 2))
+        self.frame_bases = {}
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Extend every array to the new capacity, keeping existing entities in place."""
+        extra = capacity - self.capacity
+        self.pos = np.concatenate([self.pos, np.zeros((extra, 2))])
+        self.prev_pos = np.concatenate([self.prev_pos, np.zeros((extra, 2))])
+        self.vel = np.concatenate([self.vel, np.zeros((extra, 2))])
+        self.angle = np.concatenate([self.angle, np.zeros(extra)])
+        self.spin = np.concatenate([self.spin, np.zeros(extra)])
+        self.radius = np.concatenate([self.radius, np.zeros(extra)])
+        self.half_height = np.concatenate([self.half_height, np.zeros(extra)])
+        self.kind = np.concatenate([self.kind, np.zeros(extra, dtype=np.int8)])
+        self.active = np.concatenate([self.active, np.zeros(extra, dtype=bool)])
+        self.frame_base = np.concatenate([self.frame_base, np.zeros(extra, dtype=np.intp)])
+        self.frame = np.concatenate([self.frame, np.zeros(extra, dtype=np.intp)])
+        self.step_buffer = np.zeros((capacity, 2))
+        self.sprites.extend([None] * extra)
+        self.free_slots.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def add_frames(self, key, frames, render_image=None):
+        """
+        Register the frames entities of an image key cycle through, in angle order.
+        render_image maps each image to the surface actually drawn (e.g. RenderScale.image).
+        """
+        self.frame_bases[key] = len(self.frames)
+        self.frames.extend(frames)
+        self.render_images.extend(render_image(image) if render_image else image for image, _, _ in frames)
+        self.frame_offsets = np.array([(rect.x, rect.y) for _, _, rect in self.frames])
+
+    def add(self, sprite, center, velocity, kind, frames_key, spin=0, angle=0):
+        """Register a sprite showing the frames of frames_key and return its slot index."""
+        if not self.free_slots:
+            self.grow(self.capacity * 2)
+        slot = self.free_slots.pop()
+        self.pos[slot] = center
+        self.prev_pos[slot] = center
+        self.vel[slot] = velocity
+        self.angle[slot] = angle
+        self.spin[slot] = spin
+        self.radius[slot] = bounding_radius(sprite)
+        self.half_height[slot] = sprite.half_height
+        self.kind[slot] = kind
+        self.active[slot] = True
+        self.frame_base[slot] = self.frame_bases[frames_key]
+        self.frame[slot] = 0
+        self.sprites[slot] = sprite
+        return slot
+
+    def remove(self, slot):
+        """Free a slot. Its velocity and spin are zeroed so the vectorized step leaves it untouched."""
+        self.active[slot] = False
+        self.vel[slot] = 0
+        self.spin[slot] = 0
+        self.sprites[slot] = None
+        self.free_slots.append(slot)
+
+    def step(self, dt, cull_height, angle_step=None):
+        """
+        Advance every entity by dt in place and return the slots of the active entities that left
+        the bottom of the screen (center y minus half height below cull_height), for their sprites to release.
+        With an angle_step, each entity's frame follows its angle; without one the frames stay as they are,
+        like asteroids that stop rotating their image.
+        """
+        self.prev_pos[:] = self.pos
+        np.multiply(self.vel, dt, out=self.step_buffer)
+        self.pos += self.step_buffer
+        np.multiply(self.spin, dt, out=self.step_buffer[:, 0])
+        self.angle += self.step_buffer[:, 0]
+        np.remainder(self.angle, 360, out=self.angle)
+        if angle_step is not None:
+            # Half-to-even rounding, like round() in RotationCache.get
+            np.divide(self.angle, angle_step, out=self.step_buffer[:, 0])
+            np.rint(self.step_buffer[:, 0], out=self.step_buffer[:, 0])
+            np.remainder(self.step_buffer[:, 0], round(360 / angle_step), out=self.step_buffer[:, 0])
+            self.frame[:] = self.step_buffer[:, 0]
+        return np.flatnonzero(self.active & (self.pos[:, 1] - self.half_height > cull_height)).tolist()
+
+    def draw(self, blits, alpha, scale=1.0):
+        """
+        Draw every active entity alpha of the way between its previous and current tick positions,
+        scaled by scale, with a single call to a Surface.blits-like function. Returns what blits returns.
+        """
+        slots = np.flatnonzero(self.active)
+        if not len(slots):
+            return []
+        previous = self.prev_pos[slots]
+        frames = self.frame_base[slots] + self.frame[slots]
+        topleft = (previous + (self.pos[slots] - previous) * alpha + self.frame_offsets[frames]) * scale
+        images = self.render_images
+        return blits(zip([images[frame] for frame in frames.tolist()], topleft.tolist()))
+
+    def place(self, slot):
+        """
+        Give a slot's sprite the image, mask and rect of its current frame, on its center rounded to
+        whole pixels half-to-even like round() in the sprite path. Only collision candidates need this.
+        """
+        self.sprites[slot].set_frame(*self.frames[self.frame_base[slot] + self.frame[slot]],
+                                     np.rint(self.pos[slot]).tolist())
+
+    def spritecollide(self, sprite, kind, dokill, precise=True):
+        """
+        Vectorized bounding-circle broad-phase against every entity of a kind, followed by mask tests.
+        With precise=False the mask tests are skipped and tighter circles (within overlapping rects) decide,
+        like collisions.spritecollide.
+        """
+        center = np.array(sprite.rect.center)
+        offsets = np.rint(self.pos) - center
+        reach = self.radius + bounding_radius(sprite)
+        if not precise:
+            reach = reach * CIRCLE_ONLY_RATIO
+        candidates = np.flatnonzero(self.active & (self.kind == kind) & (
+            np.einsum('ij,ij->i', offsets, offsets) <= reach * reach))
+
+        collided = []
+        for slot in candidates.tolist():
+            self.place(slot)
+            candidate = self.sprites[slot]
+            if precise:
+                if pygame.sprite.collide_mask(sprite, candidate):
+                    collided.append(candidate)
+            elif sprite.rect.colliderect(candidate.rect):
+                collided.append(candidate)
+        if dokill:
+            for candidate in collided:
+                candidate.kill()
+        return collided
@@ -0,0 +1,213 @@
+import argparse
+import math
+from abc import ABC, abstractmethod
+
+
+class HandFilter(ABC):
+    """
+    Smooths the stream of hand positions (in screen pixels) coming from an input source.
+    update() takes each new sample with its capture timestamp, and position() returns the filtered
+    position extrapolated to a given time, e.g. the time the next frame is rendered.
+    """
+
+    MAX_EXTRAPOLATION = 0.1  # Never predict further ahead than this many seconds
+
+    def __init__(self, x=0, y=0):
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Start over at a position, forgetting all previous samples."""
+        self.x, self.y = x, y
+        self.velocity_x, self.velocity_y = 0, 0
+        self.timestamp = None
+
+    @abstractmethod
+    def update(self, x, y, timestamp):
+        """Take a new sample at (x, y), captured at timestamp."""
+
+    def position(self, now):
+        """Returns the filtered position extrapolated with the estimated velocity to the time now."""
+        if self.timestamp is None:
+            return self.x, self.y
+        ahead = min(max(now - self.timestamp, 0), self.MAX_EXTRAPOLATION)
+        return self.x + self.velocity_x * ahead, self.y + self.velocity_y * ahead
+
+
+class EMAFilter(HandFilter):
+    """
+    The original smoothing: an exponential moving average of the position, pushed ahead by a decayed
+    per-sample velocity. It ignores timestamps, so it does not extrapolate between samples.
+    """
+
+    def __init__(self, x=0, y=0, smoothing_factor=0.1, prediction_factor=0.5, velocity_decay=0.5):
+        self.smoothing_factor = smoothing_factor
+        self.prediction_factor = prediction_factor
+        self.velocity_decay = velocity_decay
+        super().__init__(x, y)
+
+    def update(self, x, y, timestamp):
+        # Calculate velocity (pixels per sample)
+        dx = x - self.x
+        dy = y - self.y
+
+        # Apply velocity decay
+        self.velocity_x = self.velocity_x * self.velocity_decay + dx * (1 - self.velocity_decay)
+        self.velocity_y = self.velocity_y * self.velocity_decay + dy * (1 - self.velocity_decay)
+
+        # Predict future position
+        predicted_x = x + self.prediction_factor * self.velocity_x
+        predicted_y = y + self.prediction_factor * self.velocity_y
+
+        # Apply smoothing
+        self.x = int(self.smoothing_factor * predicted_x + (1 - self.smoothing_factor) * self.x)
+        self.y = int(self.smoothing_factor * predicted_y + (1 - self.smoothing_factor) * self.y)
+
+    def position(self, now):
+        return self.x, self.y
+
+
+def smoothing_alpha(cutoff, dt):
+    """Exponential smoothing factor for a low-pass filter with the given cutoff frequency (Hz)."""
+    tau = 1 / (2 * math.pi * cutoff)
+    return 1 / (1 + tau / dt)
+
+
+class OneEuroFilter(HandFilter):
+    """
+    One Euro filter (Casiez et al., 2012): a low-pass filter whose cutoff frequency rises with speed,
+    so slow movements are smoothed heavily (no jitter) and fast ones barely lag.
+    min_cutoff is in Hz, beta scales the cutoff with speed in pixels per second.
+    """
+
+    def __init__(self, x=0, y=0, min_cutoff=1.0, beta=0.002, derivative_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.derivative_cutoff = derivative_cutoff
+        super().__init__(x, y)
+
+    def update(self, x, y, timestamp):
+        if self.timestamp is None or timestamp <= self.timestamp:
+            if self.timestamp is None:
+                self.x, self.y = x, y
+            self.timestamp = timestamp
+            return
+        dt = timestamp - self.timestamp
+        self.timestamp = timestamp
+
+        # Smooth the speed, then use it to pick the cutoff for the position
+        alpha = smoothing_alpha(self.derivative_cutoff, dt)
+        self.velocity_x += alpha * ((x - self.x) / dt - self.velocity_x)
+        self.velocity_y += alpha * ((y - self.y) / dt - self.velocity_y)
+        speed = math.hypot(self.velocity_x, self.velocity_y)
+
+        alpha = smoothing_alpha(self.min_cutoff + self.beta * speed, dt)
+        self.x += alpha * (x - self.x)
+        self.y += alpha * (y - self.y)
+
+
+class KalmanFilter(HandFilter):
+    """
+    Constant-velocity Kalman filter, run independently on x and y.
+    process_noise is the expected acceleration noise (pixels/s^2), measurement_noise the landmark noise (pixels).
+    """
+
+    def __init__(self, x=0, y=0, process_noise=1000.0, measurement_noise=12.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        super().__init__(x, y)
+
+    def reset(self, x, y):
+        super().reset(x, y)
+        # Covariance [[position, cross], [cross, velocity]] for each axis
+        self.covariances = [[1e4, 0, 1e4], [1e4, 0, 1e4]]
+
+    def update(self, x, y, timestamp):
+        if self.timestamp is None or timestamp <= self.timestamp:
+            if self.timestamp is None:
+                self.x, self.y = x, y
+            self.timestamp = timestamp
+            return
+        dt = timestamp - self.timestamp
+        self.timestamp = timestamp
+        self.x, self.velocity_x = self.update_axis(0, self.x, self.velocity_x, x, dt)
+        self.y, self.velocity_y = self.update_axis(1, self.y, self.velocity_y, y, dt)
+
+    def update_axis(self, axis, position, velocity, measured, dt):
+        """Predict one axis forward by dt, then correct it with the measurement."""
+        pp, pv, vv = self.covariances[axis]
+        q = self.process_noise ** 2
+        r = self.measurement_noise ** 2
+
+        # Predict
+        position += velocity * dt
+        pp += dt * (2 * pv + dt * vv) + q * dt ** 4 / 4
+        pv += dt * vv + q * dt ** 3 / 2
+        vv += q * dt ** 2
+
+        # Correct
+        innovation = measured - position
+        gain_p = pp / (pp + r)
+        gain_v = pv / (pp + r)
+        position += gain_p * innovation
+        velocity += gain_v * innovation
+        self.covariances[axis] = [(1 - gain_p) * pp, (1 - gain_p) * pv, vv - gain_v * pv]
+        return position, velocity
+
+
+FILTERS = {
+    'ema': EMAFilter,
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter,
+}
+
+
+def create_filter(name, x=0, y=0):
+    """Builds one of the FILTERS by name, starting at (x, y)."""
+    if name not in FILTERS:
+        raise ValueError(f"Unknown filter {name!r}, expected one of {list(FILTERS)}")
+    return FILTERS[name](x, y)
+
+
+def evaluate_filter(hand_filter, samples, width=1280, height=720):
+    """
+    Runs a filter over recorded (seconds, x, y) samples and measures it.
+    error: mean distance between the position predicted for each sample's time and that sample (lag).
+    jitter: mean change in frame-to-frame movement of the filtered output.
+    """
+    errors = []
+    outputs = []
+    for seconds, x, y in samples:
+        x, y = x * width, y * height
+        predicted_x, predicted_y = hand_filter.position(seconds)
+        errors.append(math.hypot(predicted_x - x, predicted_y - y))
+        hand_filter.update(x, y, seconds)
+        outputs.append(hand_filter.position(seconds))
+
+    jitter = [math.hypot(x2 - 2 * x1 + x0, y2 - 2 * y1 + y0)
+              for (x0, y0), (x1, y1), (x2, y2) in zip(outputs, outputs[1:], outputs[2:])]
+    return {
+        'error': sum(errors[1:]) / max(1, len(errors) - 1),
+        'jitter': sum(jitter) / max(1, len(jitter)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare the hand filters offline on a recorded landmark stream.')
+    parser.add_argument('recording', help='Landmark file written with simulation.py --record.')
+    args = parser.parse_args()
+
+    from input_sources import load_landmarks
+
+    samples = load_landmarks(args.recording)
+    if not samples:
+        print("The recording has no samples.")
+        return
+    _, x, y = samples[0]
+    for name in FILTERS:
+        result = evaluate_filter(create_filter(name, x * 1280, y * 720), samples)
+        print(f"{name:>10}  error {result['error']:7.2f}px  jitter {result['jitter']:6.2f}px")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,28 @@
 import os
-os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
-
-import warnings
-warnings.filterwarnings("ignore", category=UserWarning, module="google.protobuf.symbol_database")
-
-import absl.logging
-absl.logging.set_verbosity(absl.logging.ERROR)
-
-import mediapipe as mp
 import pygame
 import sys
 from os.path import join
 from pygame import mixer
 from game_functions import *
 from game_classes import *
+from collisions import CollisionGroup, spritecollide
+from hand_tracking import HandTracker, open_webcam, create_hand_model
+from input_sources import LandmarkRecorder
+from filters import create_filter
+from latency import LatencyMonitor
+from profiler import FrameProfiler
+from quality import QualityGovernor
+from entity_store import EntityStore
+from sprite_pool import SpritePool
+from dirty_renderer import DirtyRectRenderer
+from render_scale import RenderScale
+from text_renderer import TextRenderer
+from animation import build_animations
+from resource_loader import ResourceLoader
+from high_scores import HighScoreStore, DEFAULT_DB_PATH
+from startup_timing import STARTUP
 import random
 import time
-import cv2
 
 
 class Game:
@@ -26,38 +32,161 @@ class Game:
     SCREEN_WIDTH = 1280
     SCREEN_HEIGHT = 720
     MAX_FPS = 60
+    FONT_SIZE = 20
+    SIM_STEP = 1 / 120  # Fixed simulation tick in seconds
+    MAX_FRAME_TIME = 0.25  # Longest frame the simulation catches up on
+    DIRTY_BG_STEP = 8  # Background scroll step in pixels for the dirty-rect renderer
+    ROTATION_STEP = 3  # Degrees between cached asteroid rotation frames
+    ASTEROID_POOL_SIZE = 64
+    SHIELD_POOL_SIZE = 4
+    INPUT_LEAD = 1 / MAX_FPS  # How far ahead of the input clock the hand position is extrapolated
+    LATENCY_TEXT_INTERVAL = 0.5  # Seconds between refreshes of the live latency display
+    PERF_OVERLAY_INTERVAL = 0.5  # Seconds between refreshes of the performance overlay
+    PROFILE_FRAMES = 300  # Frames covered by a cProfile capture (F4)
+    REDUCED_INFERENCE_INTERVAL = 1 / 15  # Time between hand inferences when the quality governor sheds load
+
+    def __init__(self, headless=False, seed=None, clock=None, input_source=None, entity_store=False,
+                 max_fps=None, vsync=False, dirty_rects=False, record_input=None, hand_filter='ema',
+                 render_scale=1.0, fullscreen=False):
+        """
+        Initialize the game, set up display, and start loading resources on worker threads.
+        Headless games wait for loading to finish, interactive ones finish it behind the loading screen.
+        In headless mode the dummy SDL video and audio drivers are used and sounds are silent.
+        seed and input_source replace the global random module and the webcam, and clock drives frame timing in run_simulation.
+        entity_store moves asteroid and shield kinematics into a vectorized NumPy EntityStore.
+        max_fps caps the frame rate (0 for uncapped, MAX_FPS by default) and vsync presents in sync with the display.
+        dirty_rects only redraws and presents the regions that changed each frame.
+        record_input is a file path the hand landmark stream is recorded to, for replay with input_sources.ReplayInput.
+        hand_filter names the filters.FILTERS entry that smooths the hand position ('ema', the original smoothing, is the default).
+        render_scale draws gameplay at that fraction of SCREEN_WIDTH x SCREEN_HEIGHT and lets pygame.SCALED stretch it
+        to the window, or to the whole display with fullscreen. The simulation always runs at the full size.
+        """
+        STARTUP.start('game_init')
+        self.headless = headless
+        self.max_fps = self.MAX_FPS if max_fps is None else max_fps
+        self.use_entity_store = entity_store
+        self.rng = random.Random(seed)
+        self.time = clock or time.time
+        self.input_source = input_source
+        self.record_input = record_input
+        self.hand_filter_name = hand_filter
+        self.show_latency = False
+        self.show_perf = False
+        self.profiler = FrameProfiler()
+        self.perf_overlay = None
+        self.overlay_font = None
+        self.perf_overlay_time = None
+        self.hand_samples = 0
+        self.render_enabled = True
+        self.gamertag = None
+        self.startup_reported = False
 
-    def __init__(self):
-        """Initialize the game, set up display, load resources, and initialize main game's objects."""
         # Initialize Pygame and mixer
-        pygame.mixer.pre_init(44100, -16, 2, 512)
-        mixer.init()
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        else:
+            pygame.mixer.pre_init(44100, -16, 2, 512)
+            mixer.init()
         pygame.init()
 
         # Set up the game window
         self.icon = pygame.image.load(join('images', 'favicon1.ico'))
         pygame.display.set_icon(self.icon)
-        self.screen = pygame.display.set_mode(
-            (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        self.render_scale = RenderScale((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), render_scale)
+        # pygame.SCALED stretches the render resolution to the window; the dummy display has nothing to stretch
+        scaled = vsync or not headless and (fullscreen or not self.render_scale.identity)
+        flags = pygame.SCALED if scaled else 0
+        if fullscreen:
+            flags |= pygame.FULLSCREEN
+        self.display = pygame.display.set_mode(self.render_scale.render_size, flags, vsync=int(vsync))
+
+        # Menus draw in simulation coordinates, onto a full-size canvas when rendering at a lower resolution
+        self.screen = self.display if self.render_scale.identity else pygame.Surface(
+            (self.SCREEN_WIDTH, self.SCREEN_HEIGHT)).convert()
         pygame.display.set_caption("astroDodger by ushellnullpath")
 
-        # Set up game clock and cursor
+        # Set up game clock, cursor and the assets needed by the gamertag screen
         self.clock = pygame.time.Clock()
         self.cursor_img = load_custom_cursor(join('images', 'cursor.png'))
         self.show_cursor = False
+        self.text_renderer = TextRenderer()
+        self.game_font = pygame.font.Font(join('font', 'PressStart2P.ttf'), self.FONT_SIZE)
+        self.render_font = self.game_font if self.render_scale.identity else pygame.font.Font(
+            join('font', 'PressStart2P.ttf'), self.render_scale.pixels(self.FONT_SIZE))
+        self.sounds = load_sounds(silent=headless, names=['input'])
 
         # Load background image
         self.bg = pygame.image.load(join('images', 'background.jpg')).convert()
         self.bg_height = self.bg.get_height()
+        self.render_bg = self.render_scale.image(self.bg)
+        self.renderer = DirtyRectRenderer(
+            self.display, self.render_bg, self.DIRTY_BG_STEP) if dirty_rects else None
+
+        # Quality levels are only changed by the governor during interactive play.
+        # Coarse background scrolling only exists in dirty-rect mode, so full redraws skip that level.
+        skip_levels = () if dirty_rects else (QualityGovernor.LEVELS.index('coarse_background'),)
+        self.quality = QualityGovernor(1 / self.max_fps if self.max_fps else 1 / self.MAX_FPS, self.apply_quality,
+                                       skip_levels=skip_levels)
+        self.apply_quality(0)
+
+        # Headless runs keep their scores in memory so they never touch the real leaderboard
+        self.high_scores = HighScoreStore(':memory:' if headless else DEFAULT_DB_PATH)
+
+        # Load the remaining resources in the background
+        self.assets_loaded = False
+        self.start_loading()
+        self.init_game_variables()
+        if headless:
+            self.finish_loading()
+        STARTUP.mark('game_ready', since='game_init')
+
+    def start_loading(self):
+        """
+        Starts decoding images and sounds, and opening the webcam and hand model when they are needed, on worker threads.
+        """
+        jobs = []
+        if self.input_source is None:
+            # The slowest jobs go first
+            jobs.append(('hand_model', 'Loading hand tracking model', create_hand_model))
+            jobs.append(('webcam', 'Starting webcam', open_webcam))
+        jobs.append(('images', 'Loading images', load_images, False))
+        jobs.append(('ui_images', 'Loading interface', load_ui_images))
+        jobs.append(('sounds', 'Loading sounds', load_sounds, self.headless,
+                     [name for name in SOUND_FILES if name != 'input']))
+
+        # One worker per job, so none of them waits in the queue and loading takes as long as the slowest job
+        self.loader = ResourceLoader(max_workers=len(jobs))
+        for job in jobs:
+            self.loader.submit(*job)
+
+    def finish_loading(self):
+        """
+        Waits for the loading jobs and prepares everything that has to run on the main thread.
+        """
+        if self.assets_loaded:
+            return
 
         # Load game resources
-        self.image_dict = load_images()
-        self.sounds = load_sounds()
+        self.image_dict = convert_images(self.loader.result('images'))
+        self.ui_images = self.loader.result('ui_images')
+        self.rotation_cache = RotationCache(
+            dict(zip(['L', 'M', 'S'], self.image_dict['asteroids'])), self.ROTATION_STEP)
+        self.rotation_cache.preload()
+        self.render_scale.preload([image for group in self.image_dict.values() for image in group] +
+                                  [frame[0] for frame in self.rotation_cache.frames.values()])
+        self.animations = build_animations(self.image_dict)
+        self.asteroid_pool = SpritePool(
+            lambda: Asteroid([], None, self), self.ASTEROID_POOL_SIZE)
+        self.shield_pool = SpritePool(
+            lambda: Shield([], None, self.image_dict, self, 1), self.SHIELD_POOL_SIZE)
+        self.sounds.update(self.loader.result('sounds'))
         self.set_sound_volumes()
 
-        # Initialize main game variables and objects
-        self.init_game_variables()
+        # Initialize main game objects
         self.init_game_objects()
+        self.assets_loaded = True
+        STARTUP.mark('assets_loaded', since='loading')
 
     def set_sound_volumes(self):
         """Set the volume levels for various game sounds."""
@@ -83,15 +212,17 @@ class Game:
         self.wave_number = 0
         self.wave_interval = 30
         self.initial_wave_duration = 30
-        self.wave_duration_increment = random.randint(10, 20)
+        self.wave_duration_increment = self.rng.randint(10, 20)
         self.wave_duration = self.initial_wave_duration
         self.wave_active = False
 
         # Game state variables
         self.dt = 0
+        self.sim_time = 0
+        self.accumulator = 0
+        self.previous_centers = {}
         self.game_state = GameState.LOADING
         self.explosion_in_progress = False
-        self.gamertag = None
 
         # Alert system variables
         self.alert_text = ""
@@ -106,53 +237,84 @@ class Game:
         """Initializes game objects including sprites and UI elements."""
         # Create sprite groups
         self.all_sprites = pygame.sprite.Group()
-        self.asteroids = pygame.sprite.Group()
-        self.shields = pygame.sprite.Group()
+        self.asteroids = CollisionGroup()
+        self.shields = CollisionGroup()
         self.explosions = pygame.sprite.Group()
 
+        # Create UI, drawn straight at the render resolution
+        self.ui = UI(*self.render_scale.render_size, self.text_renderer, self.render_font,
+                     {name: self.render_scale.image(image) for name, image in self.ui_images.items()},
+                     self.render_scale.factor)
+
+        self.init_session_objects()
+
+    def init_session_objects(self):
+        """Creates the objects that start fresh every session: the player, entity store and UI state."""
+        self.entity_store = None
+        if self.use_entity_store:
+            self.entity_store = EntityStore()
+            for image_type in self.rotation_cache.images:
+                self.entity_store.add_frames((EntityStore.ASTEROID, image_type),
+                                             self.rotation_cache.frames_of(image_type), self.render_scale.image)
+            for shield_type, image in enumerate(self.image_dict['shields'], 1):
+                self.entity_store.add_frames((EntityStore.SHIELD, shield_type),
+                                             [(image, pygame.mask.from_surface(image), image.get_frect(center=(0, 0)))],
+                                             self.render_scale.image)
+
         # Create player
         self.player = Player(self.all_sprites, self.SCREEN_WIDTH,
-                             self.SCREEN_HEIGHT, self.image_dict, self)
+                             self.SCREEN_HEIGHT, self.animations, self)
         self.player.rect.midbottom = (
             self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT + self.player.rect.height // 2)
 
-        # Create UI
-        self.ui = UI(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
-        self.game_font = self.ui.game_font
+        self.ui.reset()
 
     def create_asteroid(self):
-        """Creates and returns a new asteroid object."""
-        x = random.randint(0, self.SCREEN_WIDTH)
+        """Creates and returns a new asteroid object, reusing a pooled one when available."""
+        x = self.rng.randint(0, self.SCREEN_WIDTH)
         y = -50
-        new_asteroid = Asteroid(
-            [self.all_sprites, self.asteroids], (x, y), self.image_dict, self)
+        new_asteroid = self.asteroid_pool.acquire(
+            self.entity_groups(self.asteroids), (x, y))
         return new_asteroid
 
     def create_shield(self, shield_type):
-        """Creates and returns a new shield object of the specified type."""
-        x = random.randint(0, self.SCREEN_WIDTH)
+        """Creates and returns a new shield object of the specified type, reusing a pooled one when available."""
+        x = self.rng.randint(0, self.SCREEN_WIDTH)
         y = -50
-        new_shield = Shield([self.all_sprites, self.shields],
-                            (x, y), self.image_dict, self, shield_type)
+        new_shield = self.shield_pool.acquire(
+            self.entity_groups(self.shields), (x, y), shield_type)
         return new_shield
 
+    def entity_groups(self, group):
+        """
+        Returns the groups a new asteroid or shield joins. The entity store moves and draws its entities
+        from its own arrays, so they stay out of all_sprites.
+        """
+        if self.entity_store is not None:
+            return [group]
+        return [self.all_sprites, group]
+
     def spawn_shields(self):
         """Spawns shields during active waves based on probability."""
         if self.wave_active:
             # Spawn Shield 1 (max 3 per wave)
-            if self.shield1_count < 3 and random.random() < 0.005:
+            if self.shield1_count < 3 and self.rng.random() < 0.005:
                 self.create_shield(1)
                 self.shield1_count += 1
 
             # Spawn Shield 2 (only once per wave)
-            if not self.shield2_spawned and random.random() < 0.002:
+            if not self.shield2_spawned and self.rng.random() < 0.002:
                 self.create_shield(2)
                 self.shield2_spawned = True
 
     def handle_shield_collisions(self):
         """Checks for collisions between the player and shields, and apply shield effects."""
-        collided_shields = pygame.sprite.spritecollide(
-            self.player, self.shields, True, pygame.sprite.collide_mask)
+        if self.entity_store is not None:
+            collided_shields = self.entity_store.spritecollide(
+                self.player, EntityStore.SHIELD, True, self.precise_collisions)
+        else:
+            collided_shields = spritecollide(
+                self.player, self.shields, True, self.precise_collisions)
         for shield in collided_shields:
             self.player.add_shield(shield.shield_type)
             self.sounds['shield_pickUp'].play()
@@ -167,12 +329,15 @@ class Game:
         if self.game_state != GameState.PLAYING or self.player.is_exploding:
             return
 
-        current_time = time.time()
+        current_time = self.sim_time
         time_since_start = current_time - self.game_start_time
 
+        start = self.profiler.clock()
         self.handle_wave_logic(current_time, time_since_start)
         self.spawn_asteroids()
+        start = self.profiler.lap(FrameProfiler.SPAWN, start)
         self.handle_collisions()
+        self.profiler.lap(FrameProfiler.COLLISIONS, start)
 
     def handle_wave_logic(self, current_time, time_since_start):
         """
@@ -214,7 +379,7 @@ class Game:
         spawn_chance = base_spawn_rate * self.dt
 
         # Randomly decide whether to spawn an asteroid
-        if random.random() < spawn_chance:
+        if self.rng.random() < spawn_chance:
             self.create_asteroid()
 
     def handle_collisions(self):
@@ -223,8 +388,12 @@ class Game:
         """
         if not self.player.is_exploding:
             # Check for collisions between player and asteroids
-            collided_asteroids = pygame.sprite.spritecollide(
-                self.player, self.asteroids, False, pygame.sprite.collide_mask)
+            if self.entity_store is not None:
+                collided_asteroids = self.entity_store.spritecollide(
+                    self.player, EntityStore.ASTEROID, False, self.precise_collisions)
+            else:
+                collided_asteroids = spritecollide(
+                    self.player, self.asteroids, False, self.precise_collisions)
 
             for asteroid in collided_asteroids:
                 self.sounds['asteroid_impact'].play()
@@ -246,198 +415,427 @@ class Game:
                 len(self.asteroids) == 0 and
                 len(self.shields) == 0)
 
-    def game_over(self):
+    def start(self):
         """
-        Handles the game over state and cleanup.
+        Runs the session state machine (gamertag, loading, playing, game over) in a single loop until the player quits.
         """
-        self.game_state = GameState.GAME_OVER
-
-        # Release webcam if it exists
-        if hasattr(self, 'webcam'):
-            self.webcam.release()
-
-        # Show game over screen and handle replay option
-        play_again = game_over_screen(
-            self, self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.sounds['input'], self.game_font
-        )
-
-        if play_again:
-            self.all_sprites.empty()
-            self.asteroids.empty()
-            self.shields.empty()
-            self.explosions.empty()
-
-            # Reset game variables
-            self.init_game_variables()
-            self.init_game_objects()
-
-            # Restart the game
-            self.start()
-        else:
-            self.cleanup_and_exit()
+        self.game_state = GameState.GAMERTAG
+        while self.game_state != GameState.EXIT:
+            if self.game_state == GameState.GAMERTAG:
+                self.run_gamertag()
+            elif self.game_state == GameState.LOADING:
+                self.run_loading()
+            elif self.game_state == GameState.PLAYING:
+                self.run_playing()
+            elif self.game_state == GameState.GAME_OVER:
+                self.run_game_over()
+        self.cleanup_and_exit()
 
-    def start(self):
+    def run_gamertag(self):
         """
-        Initializes and starts the game, including the main game loop.
+        Shows the gamertag screen, then moves on to loading.
         """
         # Show cursor for gamertag input
         self.show_cursor = True
         self.gamertag = gamertag_screen(
             self, self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.sounds['input'], self.game_font)
-        if self.gamertag is None:
-            self.cleanup_and_exit()
-            return
+        self.game_state = GameState.EXIT if self.gamertag is None else GameState.LOADING
 
+    def run_loading(self):
+        """
+        Shows the loading screen until the background jobs are done, then starts playing.
+        Closing the window while loading exits without waiting for the jobs.
+        """
         # Hide cursor for gameplay
         self.show_cursor = False
         pygame.mouse.set_visible(False)
 
-        # Show loading screen
+        # Startup times are measured from here, leaving out the time spent on the gamertag screen
+        STARTUP.start('loading')
         self.loading_complete = False
-        loading_screen(self, self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
-
-        # Initialize hand tracking
-        if not self.init_hand_tracking():
-            print("ERROR: Failed to initialize hand tracking. Exiting game.")
-            self.cleanup_and_exit()
+        if not loading_screen(self, self.SCREEN_WIDTH, self.SCREEN_HEIGHT):
+            self.game_state = GameState.EXIT
             return
+        self.finish_loading()
 
-        # Set initial game state
-        self.game_start_time = time.time()
-        self.last_wave_time = self.game_start_time
-        self.game_state = GameState.PLAYING
-        self.ui.show_ui = True
+        if not self.begin_play():
+            print("ERROR: Failed to initialize hand tracking. Exiting game.")
+            self.game_state = GameState.EXIT
 
-        # Main game loop
-        while self.game_state != GameState.GAME_OVER:
-            self.dt = self.clock.tick() / 1000.0
+    def run_playing(self):
+        """
+        Main game loop for one session, until the player's ship is destroyed or the window is closed.
+        """
+        while self.game_state == GameState.PLAYING:
+            frame_time = self.clock.tick(self.max_fps) / 1000.0
+            work_start = self.profiler.clock()
             self.update_hand_position()
-            self.update_game_elements()
+            self.update_game_elements(frame_time)
 
-            # Handle quit event
+            # Handle quit event and the latency display toggle
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.game_state = GameState.GAME_OVER
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_debug_key(event.key)
+
+            # The governor only sees the frame's own work, not a flip blocked on vsync
+            work_time = self.profiler.clock() - work_start
+            self.present()
+            self.profiler.end_frame()
+            self.quality.update(work_time)
+            if not self.startup_reported:
+                self.report_startup()
+
+    def apply_quality(self, level):
+        """
+        Enables the features allowed at a QualityGovernor level. Every level turns one more off, in order:
+        asteroid rotation, the alert text outline, smooth background scrolling (dirty-rect mode only),
+        full-rate hand inference and per-pixel collision masks.
+        """
+        self.quality_level = level
+        self.rotate_asteroids = level < 1
+        self.outline_alert = level < 2
+        if self.renderer is not None:
+            self.renderer.bg_step = self.DIRTY_BG_STEP if level < 3 else self.DIRTY_BG_STEP * 4
+        if hasattr(self, 'hand_tracker'):
+            self.hand_tracker.limit_inference_interval(
+                self.REDUCED_INFERENCE_INTERVAL if level >= 4 else None)
+        self.precise_collisions = level < 5
+
+    def handle_debug_key(self, key):
+        """
+        F2 toggles the latency display, F3 the performance overlay, F4 profiles the next PROFILE_FRAMES frames
+        with cProfile and F5 exports the recent frame timings as a CSV trace.
+        """
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        if key == pygame.K_F2:
+            self.show_latency = not self.show_latency
+        elif key == pygame.K_F3:
+            self.show_perf = not self.show_perf
+            self.perf_overlay_time = None
+        elif key == pygame.K_F4:
+            self.profiler.start_capture(self.PROFILE_FRAMES, f'profile_{stamp}.prof')
+        elif key == pygame.K_F5:
+            print(f"Saved frame trace to {self.profiler.export(f'perf_trace_{stamp}.csv')}")
+
+    def run_game_over(self):
+        """
+        Shows the game over screen and either starts a new session right away or exits.
+        """
+        # Hand inference is not needed while the menu is showing
+        self.hand_tracker.pause()
+
+        report = self.latency.report()
+        if report:
+            print(report)
+
+        play_again = game_over_screen(
+            self, self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self.sounds['input'], self.game_font
+        )
+
+        if play_again:
+            self.reset_session()
+            self.begin_play()
+        else:
+            self.game_state = GameState.EXIT
+
+    def reset_session(self):
+        """
+        Resets only the per-session state. Loaded assets, pools, the UI, the webcam and the hand model are kept.
+        """
+        # Return asteroids and shields to their pools before clearing the groups
+        for sprite in self.asteroids.sprites() + self.shields.sprites():
+            sprite.kill()
+        self.all_sprites.empty()
+        self.explosions.empty()
+
+        self.init_game_variables()
+        self.init_session_objects()
+        self.latency.reset()
+
+    def report_startup(self):
+        """
+        Prints the startup timing report after the first gameplay frame was presented.
+        """
+        self.startup_reported = True
+        STARTUP.mark('first_frame', since='loading')
+        for name, seconds in self.loader.timings.items():
+            STARTUP.record(f'load {name}', seconds)
+        report = STARTUP.report()
+        if report:
+            print(report)
 
-            pygame.display.update()
+    def begin_play(self):
+        """
+        Initializes hand tracking (once) and sets the initial playing state.
+        """
+        if not self.init_hand_tracking():
+            return False
+        self.reset_hand_position()
+        self.hand_tracker.resume()
 
-        self.game_over()
+        # Set initial game state
+        self.game_start_time = self.sim_time
+        self.last_wave_time = self.game_start_time
+        self.game_state = GameState.PLAYING
+        self.ui.show_ui = True
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+        # Restart the frame timer, so the first frame does not catch up on the time spent in menus
+        self.clock.tick()
+        return True
+
+    def run_simulation(self, frames, render=False):
+        """
+        Runs the wave/spawn/collision/score pipeline for a number of frames without menus.
+        Requires a clock with advance() and step, such as simulation.SimulationClock.
+        Returns a summary of the run, which is identical for identical seeds.
+        """
+        self.render_enabled = render
+        if not self.begin_play():
+            return None
+
+        frames_run = 0
+        while frames_run < frames and self.game_state != GameState.GAME_OVER:
+            self.time.advance()
+            self.update_hand_position()
+            self.update_game_elements(self.time.step)
+            if render:
+                self.present()
+            self.profiler.end_frame()
+            frames_run += 1
+
+        self.stop_hand_tracking()
+        return {
+            'frames': frames_run,
+            'score': self.score,
+            'wave_number': self.wave_number,
+            'health': self.player.health,
+            'shield': self.player.shield,
+            'asteroids': len(self.asteroids),
+            'shields': len(self.shields),
+            'player_pos': tuple(self.player.rect.center),
+            'game_over': self.game_state == GameState.GAME_OVER,
+            'asteroid_pool': self.asteroid_pool.stats(),
+            'shield_pool': self.shield_pool.stats(),
+        }
+
+    def reset_hand_position(self):
+        """
+        Resets the smoothed hand position to the center of the screen.
+        """
+        self.prev_x, self.prev_y = self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT // 2
+        self.hand_filter = create_filter(self.hand_filter_name, self.prev_x, self.prev_y)
 
     def init_hand_tracking(self):
         """
-        Initializes hand tracking using OpenCV and MediaPipe.
+        Initializes hand tracking using OpenCV and MediaPipe, or the injected input source.
+        The tracker is kept running across sessions, so this only does work the first time.
         """
-        # Set up webcam
-        self.webcam = cv2.VideoCapture(0)
+        if hasattr(self, 'hand_tracker'):
+            return True
+
+        # Injected input sources (replays, videos, synthetic paths) replace the webcam entirely
+        if self.input_source is not None:
+            self.set_hand_tracker(self.input_source)
+            return True
+
+        # Set up webcam, reusing the one opened while loading
+        self.webcam = self.loader.take('webcam') or open_webcam()
         if not self.webcam.isOpened():
             print("ERROR: Could not open webcam.")
             return False
 
-        # Set webcam resolution
-        TRACKING_WIDTH, TRACKING_HEIGHT = 320, 240
-        self.webcam.set(3, TRACKING_WIDTH)
-        self.webcam.set(4, TRACKING_HEIGHT)
-
-        # Initialize MediaPipe hand tracking
-        self.hand_model = mp.solutions.hands
-        self.hand = self.hand_model.Hands(
-            min_tracking_confidence=0.3, min_detection_confidence=0.3, max_num_hands=1)
-
-        # Initialize hand tracking variables
-        self.last_hand_update_time = 0
-        self.hand_update_interval = 1 / self.MAX_FPS
-        self.smoothing_factor = 0.1
-        self.prediction_factor = 0.5
-        self.prev_x, self.prev_y = self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT // 2
-        self.velocity_x, self.velocity_y = 0, 0
-        self.velocity_decay = 0.5
+        # Initialize MediaPipe hand tracking, reusing the model built while loading
+        self.hand = self.loader.take('hand_model') or create_hand_model()
+
+        # Start the background hand tracking worker
+        tracker = HandTracker(
+            self.webcam, self.hand, min_interval=1 / self.MAX_FPS, adaptive=True)
+        tracker.start()
+        self.set_hand_tracker(tracker)
 
         return True
 
-    def update_hand_position(self):
+    def set_hand_tracker(self, source):
         """
-        Updates the hand position using webcam input and hand tracking.
+        Uses the input source for hand positions, recording what the game reads from it if requested.
         """
-        self.last_hand_update_time += self.dt
-        if self.last_hand_update_time >= self.hand_update_interval:
-            control, frame = self.webcam.read()
-            if control:
-                frame = cv2.flip(frame, 1)
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                result = self.hand.process(rgb)
+        if self.record_input:
+            source = LandmarkRecorder(source, self.record_input)
+        self.hand_tracker = source
+        self.apply_quality(self.quality_level)
+        self.latency = LatencyMonitor(source.clock)
+        self.latency_text = ''
+        self.latency_text_time = None
 
-                if result.multi_hand_landmarks:
-                    for handLandmark in result.multi_hand_landmarks:
-                        # Get index finger tip position
-                        index_finger_tip = handLandmark.landmark[8]
-                        new_x = int(index_finger_tip.x * self.SCREEN_WIDTH)
-                        new_y = int(index_finger_tip.y * self.SCREEN_HEIGHT)
-
-                        # Calculate velocity
-                        dx = new_x - self.prev_x
-                        dy = new_y - self.prev_y
+    def stop_hand_tracking(self):
+        """
+        Stops the hand tracking worker and releases the webcam if they exist.
+        """
+        if hasattr(self, 'hand_tracker'):
+            self.hand_tracker.stop()
+        if hasattr(self, 'webcam'):
+            self.webcam.release()
 
-                        # Apply velocity decay
-                        self.velocity_x = self.velocity_x * \
-                            self.velocity_decay + dx * \
-                            (1 - self.velocity_decay)
-                        self.velocity_y = self.velocity_y * \
-                            self.velocity_decay + dy * \
-                            (1 - self.velocity_decay)
+    def update_hand_position(self):
+        """
+        Feeds the newest sample from the input source to the hand filter, then sets the hand position
+        to the filtered position extrapolated to when this frame will be shown.
+        """
+        sample = self.hand_tracker.latest()
+        if sample is not None:
+            # Get index finger tip position
+            self.hand_filter.update(int(sample.x * self.SCREEN_WIDTH),
+                                    int(sample.y * self.SCREEN_HEIGHT), sample.timestamp)
+            self.latency.filtered(sample)
+            self.hand_samples += 1
 
-                        # Predict future position
-                        predicted_x = new_x + self.prediction_factor * self.velocity_x
-                        predicted_y = new_y + self.prediction_factor * self.velocity_y
+        self.prev_x, self.prev_y = self.hand_filter.position(
+            self.hand_tracker.clock() + self.INPUT_LEAD)
 
-                        # Apply smoothing
-                        x = int(self.smoothing_factor * predicted_x +
-                                (1 - self.smoothing_factor) * self.prev_x)
-                        y = int(self.smoothing_factor * predicted_y +
-                                (1 - self.smoothing_factor) * self.prev_y)
+    def update_game_elements(self, frame_time):
+        """
+        Advances the simulation in fixed SIM_STEP ticks covering the frame time, then draws the frame
+        interpolated between the last two ticks. Presenting the frame is left to the caller.
+        """
+        self.accumulator += min(frame_time, self.MAX_FRAME_TIME)
+        self.dt = self.SIM_STEP
+        while self.accumulator >= self.SIM_STEP:
+            self.accumulator -= self.SIM_STEP
+            self.simulate_tick()
+            if self.game_state == GameState.GAME_OVER:
+                return
 
-                        self.prev_x, self.prev_y = x, y
+        if self.render_enabled:
+            self.render_frame(self.accumulator / self.SIM_STEP)
 
-    def update_game_elements(self):
+    def simulate_tick(self):
         """
-        Updates all game elements and draws them on the screen.
+        Runs one fixed simulation step of the game logic and sprite updates.
         """
-        self.draw_background()
+        self.sim_time += self.dt
         self.play_background_music()
 
         # Update player position if not exploding
         if not self.player.is_exploding:
             self.player.x, self.player.y = self.prev_x, self.prev_y
+            self.latency.consumed()
 
         if self.game_state == GameState.PLAYING:
             if not self.explosion_in_progress:
                 self.update_asteroids()
+                start = self.profiler.clock()
                 self.spawn_shields()
+                start = self.profiler.lap(FrameProfiler.SPAWN, start)
                 self.handle_shield_collisions()
+                self.profiler.lap(FrameProfiler.COLLISIONS, start)
                 self.update_score()
             if self.explosion_in_progress and self.are_all_elements_cleared():
-                self.game_over()
+                self.game_state = GameState.GAME_OVER
                 return
 
-        # Update and draw all sprites
+        # Remember where every sprite was, so rendering can interpolate between ticks
+        start = self.profiler.clock()
+        self.previous_centers = {
+            sprite: sprite.rect.center for sprite in self.all_sprites}
+
+        # Update all sprites
+        if self.entity_store is not None:
+            angle_step = self.ROTATION_STEP if self.rotate_asteroids else None
+            for slot in self.entity_store.step(self.dt, self.SCREEN_HEIGHT, angle_step):
+                self.entity_store.sprites[slot].kill()
         self.all_sprites.update()
+        start = self.profiler.lap(FrameProfiler.SPRITE_UPDATE, start)
+
+        self.update_background_scroll()
+        self.profiler.lap(FrameProfiler.BACKGROUND, start)
+        self.update_alert()
+
+    def render_frame(self, alpha):
+        """
+        Draws the background, sprites, UI and alerts, with sprites placed alpha of the way
+        between their previous and current tick positions.
+        """
+        profiler = self.profiler
+        start = profiler.clock()
+        if self.renderer is not None:
+            self.renderer.begin_frame(self.scroll * self.render_scale.factor)
+            blit, blits = self.renderer.blit, self.renderer.blits
+        else:
+            self.draw_background()
+            blit, blits = self.display.blit, self.display.blits
+        start = profiler.lap(FrameProfiler.BACKGROUND, start)
+
+        scale = self.render_scale
         for sprite in self.all_sprites:
             if sprite not in self.explosions:
-                self.screen.blit(sprite.image, sprite.rect)
+                blit(scale.image(sprite.image), scale.rect(self.interpolated_rect(sprite, alpha)))
+        if self.entity_store is not None:
+            self.entity_store.draw(blits, alpha, scale.factor)
 
         # Draw explosion sprites on top
-        self.explosions.draw(self.screen)
-
-        self.update_ui()
-        self.handle_alert()
+        for sprite in self.explosions:
+            blit(scale.image(sprite.image), scale.rect(sprite.rect))
+        start = profiler.lap(FrameProfiler.DRAW, start)
+
+        ui_rects = self.update_ui()
+        start = profiler.lap(FrameProfiler.UI, start)
+        alert_rects = self.handle_alert()
+        profiler.lap(FrameProfiler.ALERT, start)
+        if self.show_latency:
+            alert_rects += self.draw_latency_text()
+        if self.show_perf:
+            alert_rects += self.draw_perf_overlay()
+        if self.renderer is not None:
+            self.renderer.mark(ui_rects + alert_rects)
+
+    def present(self):
+        """
+        Presents the frame once, either whole or as dirty regions.
+        """
+        start = self.profiler.clock()
+        if self.renderer is not None:
+            self.renderer.present()
+        else:
+            pygame.display.flip()
+        self.profiler.lap(FrameProfiler.PRESENT, start)
+        self.latency.presented()
 
+    def present_screen(self):
+        """
+        Presents a menu drawn on self.screen, scaling it down to the render resolution first if needed.
+        """
+        self.render_scale.present(self.screen, self.display)
         pygame.display.flip()
 
+    def interpolated_rect(self, sprite, alpha):
+        """
+        Returns the sprite's rect moved between its previous and current tick positions.
+        """
+        previous = self.previous_centers.get(sprite)
+        if previous is None or alpha >= 1:
+            return sprite.rect
+        rect = sprite.rect.copy()
+        x, y = rect.center
+        rect.center = (previous[0] + (x - previous[0]) * alpha,
+                       previous[1] + (y - previous[1]) * alpha)
+        return rect
+
     def draw_background(self):
         """
-        Draws the scrolling background.
+        Draws the scrolling background at the render resolution.
+        """
+        scroll = self.scroll * self.render_scale.factor
+        self.display.blit(self.render_bg, (0, scroll))
+        self.display.blit(self.render_bg, (0, scroll - self.render_bg.get_height()))
+
+    def update_background_scroll(self):
+        """
+        Advances the background scroll by one simulation step.
         """
-        self.screen.blit(self.bg, (0, self.scroll))
-        self.screen.blit(self.bg, (0, self.scroll - self.bg_height))
         self.scroll += self.scroll_speed * self.dt
         if self.scroll >= self.bg_height:
             self.scroll = 0
@@ -446,7 +844,7 @@ class Game:
         """
         Plays background music if it's not already playing.
         """
-        if not pygame.mixer.get_busy():
+        if pygame.mixer.get_init() and not pygame.mixer.get_busy():
             self.sounds['bg_track'].play(loops=-1, fade_ms=800)
 
     def update_score(self):
@@ -454,47 +852,96 @@ class Game:
         Updates the player's score based on survival time.
         """
         if self.game_start_time is not None:
-            current_time = time.time()
+            current_time = self.sim_time
             self.score = int(current_time - self.game_start_time)
 
     def update_ui(self):
         """
-        Updates and draw the user interface elements.
+        Updates and draw the user interface elements, returning the screen regions drawn.
         """
         self.ui.update_score(self.score)
         self.ui.update_health_bar(self.player.health)
         self.ui.update_shield_bar(self.player.shield)
-        self.ui.draw(self.screen)
+        return self.ui.draw(self.display)
 
-    def handle_alert(self):
+    def update_alert(self):
         """
-        Handles the display of alert messages.
+        Counts down the current alert message by one simulation step.
         """
         if self.alert_timer > 0:
             self.alert_timer -= self.dt
             if self.alert_timer <= 0:
                 self.alert_text = ""
-            else:
-                if (self.alert_timer * 2) % 2 > 1:
-                    self.draw_alert_text()
 
-    def draw_alert_text(self):
+    def handle_alert(self):
         """
-        Draws the alert text with a black border.
+        Handles the display of alert messages, returning the screen regions drawn.
         """
-        font = self.game_font
-        text_surface = font.render(self.alert_text, True, (255, 255, 255))
-        text_rect = text_surface.get_frect(
-            center=(self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT // 2))
+        if self.alert_timer > 0 and (self.alert_timer * 2) % 2 > 1:
+            return self.draw_alert_text()
+        return []
 
-        # Draw black border
-        for dx, dy in [(-3, -3), (-3, 0), (-3, 3), (0, -3), (0, 3), (3, -3), (3, 0), (3, 3)]:
-            border_rect = text_rect.move(dx, dy)
-            border_surface = font.render(self.alert_text, True, (0, 0, 0))
-            self.screen.blit(border_surface, border_rect)
-
-        # Draw white text
-        self.screen.blit(text_surface, text_rect)
+    def draw_alert_text(self):
+        """
+        Draws the alert text with a black border and returns the screen regions drawn.
+        """
+        scale = self.render_scale
+        return [self.text_renderer.blit(
+            self.display, self.alert_text, self.render_font, (255, 255, 255), (0, 0, 0),
+            scale.pixels(3) if self.outline_alert else 0,
+            center=scale.point(self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT // 2))]
+
+    def draw_latency_text(self):
+        """
+        Draws the live input latency line (refreshed every LATENCY_TEXT_INTERVAL) and returns the screen regions drawn.
+        """
+        now = self.latency.clock()
+        if self.latency_text_time is None or now - self.latency_text_time >= self.LATENCY_TEXT_INTERVAL:
+            self.latency_text = self.latency.live_text()
+            self.latency_text_time = now
+        scale = self.render_scale
+        return [self.text_renderer.blit(
+            self.display, self.latency_text, self.render_font, (255, 255, 255), (0, 0, 0), scale.pixels(2),
+            bottomleft=scale.point(20, self.SCREEN_HEIGHT - 20))]
+
+    def draw_perf_overlay(self):
+        """
+        Draws the performance overlay (rebuilt every PERF_OVERLAY_INTERVAL) and returns the screen regions drawn.
+        """
+        now = self.profiler.clock()
+        if self.perf_overlay_time is None or now - self.perf_overlay_time >= self.PERF_OVERLAY_INTERVAL:
+            elapsed = now - self.perf_overlay_time if self.perf_overlay_time is not None else 0
+            hand_rate = self.hand_samples / elapsed if elapsed else 0
+            self.hand_samples = 0
+            self.perf_overlay_time = now
+
+            window = self.max_fps or self.MAX_FPS
+            p50, p95, p99 = self.profiler.frame_time_percentiles(count=window)
+            lines = [
+                f"FPS {self.clock.get_fps():.0f}  FRAME P50 {p50:.1f} P95 {p95:.1f} P99 {p99:.1f}MS",
+                f"ASTEROIDS {len(self.asteroids)} SHIELDS {len(self.shields)} EXPLOSIONS {len(self.explosions)}",
+                f"HAND {hand_rate:.0f}/S",
+                f"QUALITY {QualityGovernor.LEVELS[self.quality.level].upper()}",
+            ]
+            if self.quality.transitions:
+                lines.append(f"LAST {self.quality.transitions[-1].upper()}")
+            lines += [f"{stage.upper():<14}{ms:6.2f}MS"
+                      for stage, ms in self.profiler.stage_means(window).items()]
+            self.perf_overlay = self.build_overlay(lines)
+        return [self.display.blit(self.perf_overlay, self.render_scale.point(20, 120))]
+
+    def build_overlay(self, lines):
+        """Renders lines of text onto a translucent panel."""
+        if self.overlay_font is None:
+            self.overlay_font = pygame.font.Font(join('font', 'PressStart2P.ttf'), 10)
+        line_height = self.overlay_font.get_linesize() + 4
+        surfaces = [self.overlay_font.render(line, False, (255, 255, 255)) for line in lines]
+        panel = pygame.Surface((max(surface.get_width() for surface in surfaces) + 16,
+                                line_height * len(lines) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, surface in enumerate(surfaces):
+            panel.blit(surface, (8, 8 + i * line_height))
+        return panel
 
     def cleanup_and_exit(self):
         """
@@ -504,16 +951,19 @@ class Game:
         pygame.mixer.stop()
 
         # Clear all sprite groups
-        self.all_sprites.empty()
-        self.asteroids.empty()
-        self.shields.empty()
-        self.explosions.empty()
+        if self.assets_loaded:
+            self.all_sprites.empty()
+            self.asteroids.empty()
+            self.shields.empty()
+            self.explosions.empty()
 
-        # Release webcam if it exists
-        if hasattr(self, 'webcam'):
-            self.webcam.release()
+        # Stop loading jobs, hand tracking and release webcam if it exists
+        self.loader.shutdown()
+        self.stop_hand_tracking()
+
+        # Write any queued scores before exiting
+        self.high_scores.close()
 
-        cv2.destroyAllWindows()
         pygame.mixer.quit()
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -1,7 +1,11 @@
+import math
 import pygame
-import random
 from os.path import join
-from game_functions import cycle_player_imgs, load_and_scale_imgs
+from game_functions import load_ui_images
+from animation import AnimationClock
+from collisions import collide
+from entity_store import EntityStore
+from text_renderer import TextRenderer
 
 
 class Player(pygame.sprite.Sprite):
@@ -9,20 +13,17 @@ class Player(pygame.sprite.Sprite):
     The player (spaceship) in the game. Handles its movement, animation, health, shields, and explosions.
     """
 
-    def __init__(self, groups, screen_width, screen_height, image_dict, game):
+    def __init__(self, groups, screen_width, screen_height, animations, game):
         super().__init__(groups)
         self.game = game
-        self.images = image_dict['spaceship']
-        self.idle_image_index = 0
-        self.image = self.images[self.idle_image_index]
-        self.rect = self.image.get_frect(
+        self.idle_frame = animations['ship_idle'].frames[0]
+        self.set_frame(self.idle_frame)
+        self.rect = self.idle_frame.rect.move_to(
             center=(screen_width / 2, screen_height / 2))
-        self.mask = pygame.mask.from_surface(self.image)
 
         # Movement and animation attributes
         self.is_moving = False
-        self.animation_speed = 0.2
-        self.animation_timer = 0
+        self.flying = AnimationClock(animations['ship_flying'])
         self.movement_threshold = 3
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -38,11 +39,13 @@ class Player(pygame.sprite.Sprite):
         self.has_permanent_shield = False
 
         # Explosion attributes
-        self.explosion_images = image_dict['explosions']
-        self.explosion_index = 0
+        self.explosion = AnimationClock(animations['explosion'], index=-1)
         self.is_exploding = False
-        self.explosion_timer = 0
-        self.explosion_speed = 0.1
+
+    def set_frame(self, frame):
+        """Show a precomputed animation frame (image and mask)."""
+        self.image = frame.image
+        self.mask = frame.mask
 
     def update(self):
         """Update the player's state each frame."""
@@ -71,16 +74,11 @@ class Player(pygame.sprite.Sprite):
 
         if self.is_moving:
             self.rect.center = (new_x, new_y)
-            self.animation_timer += self.game.dt
-            if self.animation_timer >= self.animation_speed:
-                self.animation_timer = 0
-                self.idle_image_index, self.image = cycle_player_imgs(
-                    self.idle_image_index, self.images[1:])
-                self.mask = pygame.mask.from_surface(self.image)
-        else:
-            self.idle_image_index = 0
-            self.image = self.images[0]
-            self.mask = pygame.mask.from_surface(self.image)
+            if self.flying.advance(self.game.dt):
+                self.set_frame(self.flying.frame)
+        elif self.image is not self.idle_frame.image:
+            self.flying.index = 0
+            self.set_frame(self.idle_frame)
 
     def take_damage(self, amount):
         """Apply damage to the player, considers shields first."""
@@ -116,102 +114,199 @@ class Player(pygame.sprite.Sprite):
 
     def explode(self):
         """Handle the player's explosion animation."""
-        self.explosion_timer += self.game.dt
-        if self.explosion_timer >= self.explosion_speed:
-            self.explosion_timer = 0
-            if self.explosion_index < len(self.explosion_images):
-                self.image = self.explosion_images[self.explosion_index]
-                self.explosion_index += 1
-            else:
+        if self.explosion.advance(self.game.dt):
+            if self.explosion.finished:
                 self.kill()
+            else:
+                self.set_frame(self.explosion.frame)
 
     def start_explosion(self):
         """Initiate the explosion sequence."""
         self.is_exploding = True
-        self.explosion_index = 0
+        self.explosion.index = -1
         self.game.sounds['explosion'].play()
         self.game.explosions.add(self)
 
     def is_explosion_complete(self):
         """Check if the explosion animation is complete."""
-        return self.is_exploding and self.explosion_index >= len(self.explosion_images)
+        return self.is_exploding and self.explosion.on_last_frame
 
 
-class Asteroid(pygame.sprite.Sprite):
+class Entity(pygame.sprite.Sprite):
     """
-    Asteroid in the game. Handles its movement, rotation, and collision detection.
+    Base for the sprites that fall down the screen (asteroids and shields), spawned from a SpritePool
+    and optionally moved by the game's EntityStore. Handles their launch, movement, culling, collision
+    test and the return to their pool. Pools build detached sprites (pos=None) and reset() them on spawn.
     """
 
-    def __init__(self, groups, pos, image_dict, game, speed_range=(100, 500)):
-        super().__init__(groups)
+    def __init__(self, game, pool=None):
+        super().__init__()
         self.game = game
-        self.type = random.choice(['L', 'M', 'S'])
-        self.original_image = image_dict['asteroids'][[
-            'L', 'M', 'S'].index(self.type)]
-        self.image = self.original_image
-        self.rect = self.image.get_frect(center=pos)
-        self.mask = pygame.mask.from_surface(self.image)
-
-        self.pos = pygame.math.Vector2(self.rect.topleft)
-        self.direction = pygame.math.Vector2(
-            random.uniform(-0.5, 0.5), 1).normalize()
-        self.speed = random.uniform(*speed_range)
-
-        self.rotation = 0
-        self.rotation_speed = random.randint(20, 50)
+        self.pool = pool
+        self.slot = None
+        self.pos = pygame.math.Vector2()
+        self.direction = pygame.math.Vector2()
+
+    def launch(self, speed_range):
+        """Start moving from the rect's center, slightly off vertical, at a random speed."""
+        # The position is the float center; the rect is placed on it rounded to whole pixels
+        self.pos.update(self.rect.center)
+        self.direction.update(self.game.rng.uniform(-0.5, 0.5), 1)
+        self.direction.normalize_ip()
+        self.speed = self.game.rng.uniform(*speed_range)
+
+    def spawn(self, groups, kind, frames_key, spin=0):
+        """Hand the kinematics over to the entity store when it is enabled, and add the sprite to the groups."""
+        if self.game.entity_store is not None:
+            self.slot = self.game.entity_store.add(
+                self, self.rect.center, self.direction * self.speed, kind, frames_key, spin)
+        self.add(groups)
 
     def update(self):
-        """Update the asteroid's position and rotation."""
+        """Move the sprite one step and cull it once it has left the bottom of the screen."""
+        if self.slot is not None:
+            # Moved, culled and drawn by the entity store
+            return
+
         self.pos += self.direction * self.speed * self.game.dt
-        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
-        self.rotate()
+        self.advance((round(self.pos.x), round(self.pos.y)))
 
-        if self.rect.top > self.game.screen.get_height():
+        if self.pos.y - self.half_height > self.game.SCREEN_HEIGHT:
             self.kill()
 
-    def rotate(self):
-        """Rotate the asteroid image."""
-        self.rotation = (
-            self.rotation + self.rotation_speed * self.game.dt) % 360
-        self.image = pygame.transform.rotate(
-            self.original_image, self.rotation)
-        self.rect = self.image.get_frect(center=self.rect.center)
-        self.mask = pygame.mask.from_surface(self.image)
+    def advance(self, center):
+        """Place the sprite on its new center, rounded to whole pixels."""
+        self.rect.center = center
+
+    def set_frame(self, image, mask, frame_rect, center):
+        """Show a frame whose rect is centered on (0, 0), placed on a center."""
+        self.image = image
+        self.mask = mask
+        # Moved in place so groups holding the rect (see collisions.CollisionGroup) keep seeing it
+        self.rect.update(center[0] + frame_rect.x, center[1] + frame_rect.y, frame_rect.width, frame_rect.height)
+
+    def kill(self):
+        """Remove the sprite from all groups, release its entity store slot and return it to its pool."""
+        was_alive = self.alive()
+        if self.slot is not None:
+            self.game.entity_store.remove(self.slot)
+            self.slot = None
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
 
     def check_collision(self, player):
-        """Check for collision with the player using mask collision."""
-        return pygame.sprite.collide_mask(self, player)
+        """Check for collision with the player using a bounding-circle pre-check and mask collision."""
+        return collide(self, player)
 
 
-class Shield(pygame.sprite.Sprite):
+class Asteroid(Entity):
     """
-    Shield powerup(s) in the game. Handles its movement and collision detection.
+    Asteroid in the game. Handles its rotation on top of the Entity movement.
     """
 
-    def __init__(self, groups, pos, image_dict, game, shield_type):
-        super().__init__(groups)
-        self.game = game
-        self.shield_type = shield_type
-        self.image = image_dict['shields'][shield_type - 1]
-        self.rect = self.image.get_frect(center=pos)
-        self.mask = pygame.mask.from_surface(self.image)
+    def __init__(self, groups, pos, game, speed_range=(100, 500), pool=None):
+        super().__init__(game, pool)
+        self.rotation_cache = game.rotation_cache
+        self.speed_range = speed_range
+
+        if pos is not None:
+            self.reset(groups, pos)
+
+    def reset(self, groups, pos):
+        """Give the asteroid a new type, position, direction and speed, and add it to the groups."""
+        self.type = self.game.rng.choice(['L', 'M', 'S'])
+        self.image, self.mask, frame_rect = self.rotation_cache.get(
+            self.type, 0)
+        self.rect = frame_rect.move(pos)
+        # Sizes of the unrotated image; the enclosing circle holds every rotation
+        self.radius = math.hypot(*frame_rect.size) / 2
+        self.half_height = frame_rect.height / 2
+        self.launch(self.speed_range)
 
-        self.pos = pygame.math.Vector2(self.rect.topleft)
-        self.direction = pygame.math.Vector2(
-            random.uniform(-0.5, 0.5), 1).normalize()
-        self.speed = random.uniform(50, 150)
+        self.rotation = 0
+        self.rotation_speed = self.game.rng.randint(20, 50)
+        self.spawn(groups, EntityStore.ASTEROID, (EntityStore.ASTEROID, self.type), self.rotation_speed)
 
-    def update(self):
-        """Update the shield's position."""
-        self.pos += self.direction * self.speed * self.game.dt
-        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+    def advance(self, center):
+        """Rotate, then move the rect to a center, switching to the rotation cache frame if enabled."""
+        self.rotation = (
+            self.rotation + self.rotation_speed * self.game.dt) % 360
+        if self.game.rotate_asteroids:
+            self.set_frame(*self.rotation_cache.get(self.type, self.rotation), center)
+        else:
+            self.rect.center = center
 
-        if self.rect.top > self.game.SCREEN_HEIGHT:
-            self.kill()
 
-    def check_collision(self, player):
-        """Check for collision with the player using mask collision."""
-        return pygame.sprite.collide_mask(self, player)
+class RotationCache:
+    """
+    Shared cache of pre-rotated images, their masks and rect offsets, keyed by image type and quantized angle.
+    """
+
+    def __init__(self, images, angle_step=3, max_entries=None):
+        self.images = images
+        self.angle_step = angle_step
+        self.steps = max(1, round(360 / angle_step))
+        self.max_entries = max_entries
+        self.frames = {}
+
+    def get(self, image_type, angle):
+        """
+        Returns the (image, mask, rect) frame for the given type and angle.
+        The rect is centered on (0, 0) so it can be moved to the sprite's center.
+        """
+        key = (image_type, round(angle / self.angle_step) % self.steps)
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = self.build_frame(*key)
+        return frame
+
+    def build_frame(self, image_type, step):
+        """Rotate, mask and store a single frame, evicting the oldest one if the cache is full."""
+        if self.max_entries is not None and len(self.frames) >= self.max_entries:
+            del self.frames[next(iter(self.frames))]
+        image = pygame.transform.rotate(
+            self.images[image_type], step * self.angle_step)
+        frame = (image, pygame.mask.from_surface(image),
+                 image.get_frect(center=(0, 0)))
+        self.frames[(image_type, step)] = frame
+        return frame
+
+    def frames_of(self, image_type):
+        """Returns every frame of an image type in angle order."""
+        return [self.get(image_type, step * self.angle_step) for step in range(self.steps)]
+
+    def preload(self):
+        """Build every frame up front so no rotation happens during gameplay."""
+        for image_type in self.images:
+            for step in range(self.steps):
+                if (image_type, step) not in self.frames:
+                    self.build_frame(image_type, step)
+
+
+class Shield(Entity):
+    """
+    Shield powerup(s) in the game. Moves like every Entity and knows the shield type it grants.
+    """
+
+    def __init__(self, groups, pos, image_dict, game, shield_type, pool=None):
+        super().__init__(game, pool)
+        self.images = image_dict['shields']
+        self.masks = [pygame.mask.from_surface(image) for image in self.images]
+
+        if pos is not None:
+            self.reset(groups, pos, shield_type)
+
+    def reset(self, groups, pos, shield_type):
+        """Give the shield a new type, position, direction and speed, and add it to the groups."""
+        self.shield_type = shield_type
+        self.image = self.images[shield_type - 1]
+        self.rect = self.image.get_frect(center=pos)
+        self.mask = self.masks[shield_type - 1]
+        self.radius = math.hypot(*self.rect.size) / 2
+        self.half_height = self.rect.height / 2
+        self.launch((50, 150))
+        self.spawn(groups, EntityStore.SHIELD, (EntityStore.SHIELD, shield_type))
 
 
 class UI:
@@ -219,78 +314,99 @@ class UI:
     Handles the game's user interface elements by managing the health bar, shield bar, and score display.
     """
 
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, text_renderer=None, game_font=None, images=None, scale=1):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.game_font = pygame.font.Font(join('font', 'PressStart2P.ttf'))
-
-        scale_factor = 1.3
-
-        # Load and position UI elements
-        self.ui_slot = load_and_scale_imgs(
-            join('images', 'ui_Slots.png'), scale_factor)
-        self.ui_slot_pos = (15, 15)
+        self.margin = round(20 * scale)
+        self.game_font = game_font or pygame.font.Font(
+            join('font', 'PressStart2P.ttf'))
+        self.text_renderer = text_renderer or TextRenderer()
+
+        # Use images decoded by the resource loader when available
+        if images is None:
+            images = load_ui_images()
+        images = {name: image.convert_alpha() for name, image in images.items()}
+
+        # Load and position UI elements; the offsets are for a 1280x720 screen and follow the scale of the images
+        self.ui_slot = images['Slots']
+        self.ui_slot_pos = (round(15 * scale), round(15 * scale))
         self.ui_slot_rect = self.ui_slot.get_frect(topleft=self.ui_slot_pos)
 
-        self.full_health_bar = load_and_scale_imgs(
-            join('images', 'ui_Health.png'), scale_factor)
-        self.ui_health = self.full_health_bar.copy()
-        ui_health_offset_x, ui_health_offset_y = 47, 10
-        self.health_rect = self.ui_health.get_frect(
+        self.full_health_bar = images['Health']
+        ui_health_offset_x, ui_health_offset_y = round(47 * scale), round(10 * scale)
+        self.health_rect = self.full_health_bar.get_frect(
             topleft=(self.ui_slot_rect.left + ui_health_offset_x,
                      self.ui_slot_rect.top + ui_health_offset_y))
 
         self.health_bar_original_width = self.health_rect.width
+        self.health_area = self.full_health_bar.get_rect()
+        self.health_backing = self.full_health_bar.get_rect(
+            topleft=self.health_rect.topleft)
 
-        self.full_shield_bar = load_and_scale_imgs(
-            join('images', 'ui_Shield.png'), scale_factor)
-        self.ui_shield = self.full_shield_bar.copy()
-        ui_shield_offset_x, ui_shield_offset_y = 47, 42
-        self.shield_rect = self.ui_health.get_frect(
+        self.full_shield_bar = images['Shield']
+        ui_shield_offset_x, ui_shield_offset_y = round(47 * scale), round(42 * scale)
+        self.shield_rect = self.full_health_bar.get_frect(
             topleft=(self.ui_slot_rect.left + ui_shield_offset_x,
                      self.ui_slot_rect.top + ui_shield_offset_y))
 
         self.shield_bar_original_width = self.shield_rect.width
+        self.shield_area = self.full_shield_bar.get_rect()
+        self.shield_backing = self.full_shield_bar.get_rect(
+            topleft=self.shield_rect.topleft)
+
+        self.reset()
 
+    def reset(self):
+        """Hide the UI and reset the score and bars for a new session."""
         self.show_ui = False
 
         self.score = 0
-        self.score_text = self.game_font.render(
-            'SCORE:0', True, (255, 255, 255))
+        self.score_text = self.text_renderer.render(
+            'SCORE:0', self.game_font, (255, 255, 255))
+        self.score_rect = self.score_text.get_frect(
+            topright=(self.screen_width - self.margin, self.margin))
+        self.health_area.width = self.health_bar_original_width
+        self.shield_area.width = self.shield_bar_original_width
 
     def update_score(self, score):
-        """Update the score display."""
+        """Update the score display and its position, only when the score changes."""
         if score != self.score:
             self.score = score
-            self.score_text = self.game_font.render(
-                f'SCORE:{score}', True, (255, 255, 255))
+            self.score_text = self.text_renderer.render(
+                f'SCORE:{score}', self.game_font, (255, 255, 255))
+            self.score_rect = self.score_text.get_frect(
+                topright=(self.screen_width - self.margin, self.margin))
 
     def update_health_bar(self, player_health):
-        """Update the health bar display based on player's current health."""
+        """Update the visible width of the health bar, only when it changes."""
         health_percentage = player_health / 100
         new_width = int(self.health_bar_original_width * health_percentage)
-        self.ui_health = pygame.Surface(self.full_health_bar.get_size())
-        self.ui_health.blit(self.full_health_bar, (0, 0),
-                            (0, 0, new_width, self.full_health_bar.get_height()))
+        if new_width != self.health_area.width:
+            self.health_area.width = new_width
 
     def update_shield_bar(self, player_shield):
-        """Update the shield bar display based on player's current shield."""
+        """Update the visible width of the shield bar, only when it changes."""
         shield_percentage = player_shield / 100
         new_width = int(self.shield_bar_original_width * shield_percentage)
-        self.ui_shield = pygame.Surface(self.full_shield_bar.get_size())
-        self.ui_shield.blit(self.full_shield_bar, (0, 0),
-                            (0, 0, new_width, self.full_shield_bar.get_height()))
+        if new_width != self.shield_area.width:
+            self.shield_area.width = new_width
 
     def draw(self, screen):
-        """Draw the UI elements on the screen."""
-        if self.show_ui:
-            screen.blit(self.ui_slot, self.ui_slot_rect)
-            screen.blit(self.ui_health, self.health_rect)
-            screen.blit(self.ui_shield, self.shield_rect)
+        """
+        Draw the UI elements on the screen and return the screen regions that were drawn.
+        The bars are clipped straight from the full bar images over a black backing, so nothing is allocated per frame.
+        """
+        if not self.show_ui:
+            return []
 
-            self.score_rect = self.score_text.get_frect()
-            self.score_rect.topright = (self.screen_width - 20, 20)
-            screen.blit(self.score_text, self.score_rect)
+        rects = [screen.blit(self.ui_slot, self.ui_slot_rect)]
+        for full_bar, bar_rect, bar_area, backing in (
+                (self.full_health_bar, self.health_rect, self.health_area, self.health_backing),
+                (self.full_shield_bar, self.shield_rect, self.shield_area, self.shield_backing)):
+            rects.append(screen.fill((0, 0, 0), backing))
+            screen.blit(full_bar, bar_rect, bar_area)
+        rects.append(screen.blit(self.score_text, self.score_rect))
+        return rects
 
 
 class GameState:
@@ -298,3 +414,5 @@ class GameState:
     LOADING = 0
     PLAYING = 1
     GAME_OVER = 2
+    GAMERTAG = 3
+    EXIT = 4
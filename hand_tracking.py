@@ -0,0 +1,419 @@
+import os
+import threading
+import time
+import warnings
+from abc import ABC, abstractmethod
+from collections import deque, namedtuple
+
+
+# timestamp is the capture time; the inference times are only known for camera and video sources.
+# device_timestamp is False when the capture backend gave no usable frame time and timestamp is when read() returned.
+HandSample = namedtuple('HandSample', ['x', 'y', 'timestamp', 'inference_start', 'inference_end', 'device_timestamp'],
+                        defaults=(None, None, True))
+
+TRACKING_WIDTH, TRACKING_HEIGHT = 320, 240
+
+
+class InputSource(ABC):
+    """
+    Interface shared by everything that can steer the ship: the webcam HandTracker, video files,
+    recorded landmark streams and synthetic paths.
+    latest() returns the newest unread HandSample (normalized index finger tip position) or None,
+    and clock() is the clock its sample timestamps come from.
+    Sources without a capture pipeline can leave the pause, resume, rate limit and stop hooks as no-ops.
+    """
+
+    clock = time.perf_counter
+
+    @abstractmethod
+    def latest(self):
+        """Returns the newest sample that has not been read yet, or None."""
+
+    def pause(self):
+        """Stop producing samples (e.g. while a menu is shown)."""
+
+    def resume(self):
+        """Start producing samples again after pause()."""
+
+    def limit_inference_interval(self, interval=None):
+        """Keep at least interval seconds between samples, or restore the normal rate with None."""
+
+    def stop(self):
+        """Release the source for good."""
+
+
+def open_webcam(width=TRACKING_WIDTH, height=TRACKING_HEIGHT):
+    """
+    Opens the default webcam at the tracking resolution. Check isOpened() on the result.
+    """
+    # OpenCV and MediaPipe are imported lazily so the launcher and headless runs start quickly
+    import cv2
+
+    webcam = cv2.VideoCapture(0)
+    if webcam.isOpened():
+        # MJPG keeps USB bandwidth low, and a single-frame buffer stops stale frames from queuing up
+        webcam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        webcam.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        webcam.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        webcam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return webcam
+
+
+def import_mediapipe():
+    """
+    Imports MediaPipe with its TensorFlow and absl logging noise silenced.
+    Safe to call from a background thread to warm the import up early.
+    """
+    os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
+    warnings.filterwarnings("ignore", category=UserWarning,
+                            module="google.protobuf.symbol_database")
+
+    import absl.logging
+    absl.logging.set_verbosity(absl.logging.ERROR)
+
+    import mediapipe as mp
+    return mp
+
+
+def create_hand_model():
+    """
+    Builds the MediaPipe hand tracking model.
+    """
+    mp = import_mediapipe()
+    return mp.solutions.hands.Hands(
+        min_tracking_confidence=0.3, min_detection_confidence=0.3, max_num_hands=1)
+
+
+class LatestValueMailbox:
+    """
+    Single-slot mailbox that only keeps the newest published value.
+    Publishing and reading swap one tuple reference, which is atomic in CPython, so no lock is needed.
+    """
+
+    def __init__(self):
+        self.slot = (0, None)
+
+    def publish(self, sequence, value):
+        """Replace the slot content with a new value."""
+        self.slot = (sequence, value)
+
+    def read(self):
+        """Return the (sequence, value) pair currently in the slot."""
+        return self.slot
+
+
+class HandTracker(InputSource):
+    """
+    Captures webcam frames and runs MediaPipe hand inference on a background thread.
+    The newest index finger tip position (normalized 0-1) is published through a LatestValueMailbox,
+    so camera latency and inference time never block the render loop.
+
+    With roi=True (opt-in), inference only sees a region around the previously detected hand and falls back to
+    the full frame when the hand is lost. MediaPipe's video mode tracks the hand in the previous image's
+    coordinates, so every switch between the full frame and a crop can cost a detection; compare with
+    simulation.py --roi before turning it on. The region stays fixed while the hand is inside it and is only
+    re-centred when the hand nears its edge, so MediaPipe's own frame-to-frame tracking keeps working
+    in the same image coordinates. With adaptive=True, the capture resolution and inference rate
+    are stepped down while inference is slower than the frame budget, and back up once it is fast again.
+    With owns_capture=True, stop() also releases the webcam (or video file).
+    """
+
+    INDEX_FINGER_TIP = 8
+    ROI_MARGIN = 0.75  # Extra space around the hand box, as a fraction of the box size
+    ROI_MIN_SIZE = 0.35  # Smallest region of interest, as a fraction of the frame
+    ROI_EDGE = 0.1  # Re-centre the region once the hand comes this close to its edge, as a fraction of its size
+    RESOLUTIONS = [(TRACKING_WIDTH, TRACKING_HEIGHT), (256, 192), (160, 120)]
+    MAX_INTERVAL = 1 / 15  # Slowest inference rate the adaptive mode falls back to
+    ADAPT_COOLDOWN = 2.0  # Seconds between adaptive changes
+    SLOW_FACTOR = 1.0  # Step down when average inference exceeds the budget by this factor
+    FAST_FACTOR = 0.5  # Step back up when average inference is under this fraction of the budget
+    MAX_CAPTURE_AGE = 1.0  # Backend frame timestamps older than this (seconds) are not on our clock
+
+    def __init__(self, webcam, hand, min_interval=0, roi=False, adaptive=False, owns_capture=False):
+        self.webcam = webcam
+        self.owns_capture = owns_capture
+        self.clock = time.perf_counter  # Clock of the sample timestamps
+        self.hand = hand
+        self.min_interval = min_interval
+        self.base_interval = min_interval
+        self.requested_interval = min_interval
+        self.use_roi = roi
+        self.adaptive = adaptive
+        self.roi = None
+        self.resolution_level = 0
+        self.last_adapt_time = time.perf_counter()
+        self.mailbox = LatestValueMailbox()
+        self.running = False
+        self.thread = None
+        self.active = threading.Event()
+        self.active.set()
+
+        # Capture and color conversion buffers, reused every frame
+        self.frame = None
+        self.rgb_buffer = None
+        self.inference_start = self.inference_end = None
+
+        # Stats, written by the worker and read by the game loop
+        self.frames_captured = 0
+        self.failed_reads = 0
+        self.detections = 0
+        self.roi_detections = 0
+        self.reacquisitions = 0
+        self.roi_misses = 0
+        self.roi_recenters = 0
+        self.samples_consumed = 0
+        self.samples_dropped = 0
+        self.last_consumed_sequence = 0
+        self.inference_times = deque(maxlen=120)
+
+    def start(self):
+        """Start the worker thread."""
+        self.running = True
+        self.thread = threading.Thread(
+            target=self.run, name='HandTracker', daemon=True)
+        self.thread.start()
+
+    def pause(self):
+        """Stop capturing and inferring (e.g. while a menu is shown) without releasing the webcam or model."""
+        self.active.clear()
+
+    def resume(self):
+        """Resume capturing and inferring after pause()."""
+        self.active.set()
+
+    def stop(self):
+        """Stop the worker thread and wait for the current frame to finish."""
+        self.running = False
+        self.active.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        if self.owns_capture:
+            self.webcam.release()
+
+    def run(self):
+        """Worker loop: capture, convert and infer continuously."""
+        import cv2
+
+        sequence = 0
+        while self.running:
+            if not self.active.is_set():
+                self.active.wait()
+                continue
+            frame_start = time.perf_counter()
+            control, frame = self.webcam.read(self.frame)
+            if not control:
+                self.failed_reads += 1
+                time.sleep(0.01)
+                continue
+            read_time = self.clock()
+            capture_time = self.device_capture_time(self.webcam.get(cv2.CAP_PROP_POS_MSEC), read_time)
+            self.frames_captured += 1
+
+            # OpenCV only allocates a new frame when the capture size changes
+            self.frame = frame
+            tip = self.detect(frame)
+            self.inference_times.append(time.perf_counter() - read_time)
+
+            if tip is not None:
+                sequence += 1
+                self.detections += 1
+                # Mirror on the landmark instead of flipping every frame's pixels
+                timestamp = read_time if capture_time is None else capture_time
+                self.mailbox.publish(sequence, HandSample(
+                    1 - tip[0], tip[1], timestamp, self.inference_start, self.inference_end, capture_time is not None))
+
+            if self.adaptive:
+                self.adapt(read_time)
+
+            remaining = self.min_interval - (time.perf_counter() - frame_start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def device_capture_time(self, position_ms, read_time):
+        """
+        Returns the backend's frame timestamp (CAP_PROP_POS_MSEC) when it is on the tracker clock, otherwise None.
+        V4L2 stamps buffers with CLOCK_MONOTONIC, the clock perf_counter uses on Linux, so it includes the
+        camera, driver and queue latency. Other backends and video files report a stream position instead,
+        which never lands within MAX_CAPTURE_AGE before the read.
+        """
+        capture_time = position_ms / 1000
+        if 0 <= read_time - capture_time <= self.MAX_CAPTURE_AGE:
+            return capture_time
+        return None
+
+    def detect(self, frame):
+        """
+        Converts and runs inference on the BGR frame, or only on the region of interest in ROI mode.
+        Returns the normalized (x, y) of the index finger tip in full (unmirrored) frame coordinates, or None.
+        """
+        height, width = frame.shape[:2]
+        if self.roi is not None:
+            left, top, right, bottom = self.roi
+            # Cropping before the color conversion also gives MediaPipe a contiguous image
+            frame = frame[top:bottom, left:right]
+        else:
+            left, top, right, bottom = 0, 0, width, height
+        rgb = self.to_rgb(frame)
+        self.inference_start = self.clock()
+        result = self.hand.process(rgb)
+        self.inference_end = self.clock()
+
+        if not result.multi_hand_landmarks:
+            if self.roi is not None:
+                # Hand lost inside the region, search the full frame next time
+                self.roi_misses += 1
+                self.roi = None
+            return None
+
+        if self.roi is not None:
+            self.roi_detections += 1
+        elif self.use_roi:
+            self.reacquisitions += 1
+
+        # Map the landmarks from the inference region back to the full frame
+        region_width, region_height = right - left, bottom - top
+        landmarks = [((left + point.x * region_width) / width, (top + point.y * region_height) / height)
+                     for point in result.multi_hand_landmarks[0].landmark]
+        if self.use_roi and (self.roi is None or not self.inside_region(landmarks, width, height)):
+            if self.roi is not None:
+                self.roi_recenters += 1
+            self.roi = self.region_around(landmarks, width, height)
+        return landmarks[self.INDEX_FINGER_TIP]
+
+    def to_rgb(self, frame):
+        """
+        Converts a BGR frame (or a crop of one) to RGB inside a reused buffer and returns a contiguous view of it.
+        The buffer only grows, so steady-state frames allocate no pixel data.
+        """
+        import cv2
+        import numpy as np
+
+        height, width = frame.shape[:2]
+        size = height * width * 3
+        if self.rgb_buffer is None or self.rgb_buffer.size < size:
+            self.rgb_buffer = np.empty(size, dtype=np.uint8)
+        rgb = self.rgb_buffer[:size].reshape(height, width, 3)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def region_around(self, landmarks, width, height):
+        """Returns the (left, top, right, bottom) pixel region around the landmarks, with a margin."""
+        xs = [x for x, _ in landmarks]
+        ys = [y for _, y in landmarks]
+        box_width = max(max(xs) - min(xs), self.ROI_MIN_SIZE / (1 + 2 * self.ROI_MARGIN))
+        box_height = max(max(ys) - min(ys), self.ROI_MIN_SIZE / (1 + 2 * self.ROI_MARGIN))
+        center_x = (max(xs) + min(xs)) / 2
+        center_y = (max(ys) + min(ys)) / 2
+        half_width = box_width * (0.5 + self.ROI_MARGIN)
+        half_height = box_height * (0.5 + self.ROI_MARGIN)
+
+        left = max(0, int((center_x - half_width) * width))
+        top = max(0, int((center_y - half_height) * height))
+        right = min(width, int((center_x + half_width) * width) + 1)
+        bottom = min(height, int((center_y + half_height) * height) + 1)
+        if right - left < 2 or bottom - top < 2:
+            return None
+        return left, top, right, bottom
+
+    def inside_region(self, landmarks, width, height):
+        """
+        True while every landmark stays at least ROI_EDGE away from the edges of the region of interest.
+        Edges lying on the frame border are ignored, since the region cannot move past them.
+        """
+        left, top, right, bottom = self.roi
+        edge_x = (right - left) * self.ROI_EDGE
+        edge_y = (bottom - top) * self.ROI_EDGE
+        xs = [x * width for x, _ in landmarks]
+        ys = [y * height for _, y in landmarks]
+        return ((left == 0 or min(xs) >= left + edge_x) and (right == width or max(xs) <= right - edge_x) and
+                (top == 0 or min(ys) >= top + edge_y) and (bottom == height or max(ys) <= bottom - edge_y))
+
+    def adapt(self, now):
+        """
+        Steps the inference rate and capture resolution down while inference is slower than the budget,
+        and back up once it has headroom again. Changes are spaced by ADAPT_COOLDOWN to avoid oscillating.
+        """
+        if now - self.last_adapt_time < self.ADAPT_COOLDOWN or len(self.inference_times) < 30:
+            return
+        recent = list(self.inference_times)[-30:]
+        average = sum(recent) / len(recent)
+        budget = max(self.base_interval, 1 / 60)
+
+        if average > budget * self.SLOW_FACTOR:
+            # Lower the inference rate first, then the capture resolution
+            if self.min_interval < self.MAX_INTERVAL:
+                self.min_interval = min(self.MAX_INTERVAL, max(self.min_interval, budget) * 1.5)
+            elif self.resolution_level < len(self.RESOLUTIONS) - 1:
+                self.set_resolution(self.resolution_level + 1)
+            else:
+                return
+        elif average < budget * self.FAST_FACTOR:
+            # Restore the capture resolution first, then the inference rate
+            if self.resolution_level > 0:
+                self.set_resolution(self.resolution_level - 1)
+            elif self.min_interval > self.base_interval:
+                self.min_interval = max(self.base_interval, self.min_interval / 1.5)
+            else:
+                return
+        else:
+            return
+        self.last_adapt_time = now
+        self.inference_times.clear()
+
+    def limit_inference_interval(self, interval=None):
+        """
+        Keeps at least interval seconds between inferences (e.g. to shed load), or restores the requested rate with None.
+        """
+        restoring = interval is None and self.base_interval > self.requested_interval
+        self.base_interval = self.requested_interval if interval is None else max(interval, self.requested_interval)
+        if restoring or not self.adaptive:
+            # Go straight back to the requested rate; adaptive mode slows down again on its own if it must
+            self.min_interval = self.base_interval
+            if restoring:
+                self.inference_times.clear()
+        else:
+            # Keep any slower rate adaptive mode already chose
+            self.min_interval = max(self.min_interval, self.base_interval)
+
+    def set_resolution(self, level):
+        """Switch the webcam to one of the RESOLUTIONS. The region of interest is reset."""
+        import cv2
+
+        width, height = self.RESOLUTIONS[level]
+        self.webcam.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.webcam.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.resolution_level = level
+        self.roi = None
+
+    def latest(self):
+        """
+        Returns the newest sample if it has not been consumed yet, otherwise None.
+        Samples that were overwritten before the game loop read them are counted as dropped.
+        """
+        sequence, sample = self.mailbox.read()
+        if sequence <= self.last_consumed_sequence:
+            return None
+        self.samples_dropped += sequence - self.last_consumed_sequence - 1
+        self.samples_consumed += 1
+        self.last_consumed_sequence = sequence
+        return sample
+
+    def stats(self):
+        """Returns a dictionary of capture, detection and inference latency statistics."""
+        inference_times = list(self.inference_times)
+        return {
+            'frames_captured': self.frames_captured,
+            'failed_reads': self.failed_reads,
+            'detections': self.detections,
+            'roi_detections': self.roi_detections,
+            'reacquisitions': self.reacquisitions,
+            'roi_misses': self.roi_misses,
+            'roi_recenters': self.roi_recenters,
+            'capture_size': self.RESOLUTIONS[self.resolution_level],
+            'inference_interval_ms': 1000 * self.min_interval,
+            'samples_consumed': self.samples_consumed,
+            'samples_dropped': self.samples_dropped,
+            'inference_ms_avg': 1000 * sum(inference_times) / len(inference_times) if inference_times else 0,
+            'inference_ms_max': 1000 * max(inference_times) if inference_times else 0,
+        }
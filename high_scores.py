@@ -0,0 +1,122 @@
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from os.path import join
+
+
+DEFAULT_DB_PATH = join('high_scores', 'high_scores.db')
+
+
+class HighScoreStore:
+    """
+    Keeps the local high scores in SQLite behind one long-lived connection.
+    Saves are queued and written by a background thread, so the game over screen never waits on a commit.
+    Leaderboard and history queries are cached until the next write lands.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        # One connection shared by the game loop (reads) and the writer thread, guarded by a lock
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.create_schema()
+
+        self.leaderboard_cache = {}
+        self.history_cache = {}
+
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(
+            target=self.run_writer, name='HighScoreWriter', daemon=True)
+        self.writer.start()
+
+    def create_schema(self):
+        """Create the tables and indexes if they do not exist yet."""
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+
+            # Best score per gamertag (same table as earlier versions of the game)
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS high_scores
+                                 (gamertag TEXT PRIMARY KEY, score INTEGER, timestamp TEXT)''')
+            self.conn.execute('''CREATE INDEX IF NOT EXISTS high_scores_score
+                                 ON high_scores (score DESC)''')
+
+            # Every finished run, for per-player trends
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS runs
+                                 (id INTEGER PRIMARY KEY, gamertag TEXT, score INTEGER, timestamp TEXT)''')
+            self.conn.execute('''CREATE INDEX IF NOT EXISTS runs_gamertag
+                                 ON runs (gamertag, id)''')
+            self.conn.commit()
+
+    def save(self, gamertag, score):
+        """Queue a finished run to be recorded. Returns immediately."""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.pending.put((gamertag, score, timestamp))
+
+    def run_writer(self):
+        """Writer loop: record queued runs until close() sends None."""
+        while True:
+            run = self.pending.get()
+            try:
+                if run is None:
+                    return
+                self.write_run(*run)
+            finally:
+                self.pending.task_done()
+
+    def write_run(self, gamertag, score, timestamp):
+        """Add the run to the history and keep the gamertag's best score, then drop the cached queries."""
+        with self.lock:
+            self.conn.execute('INSERT INTO runs (gamertag, score, timestamp) VALUES (?, ?, ?)',
+                              (gamertag, score, timestamp))
+            self.conn.execute('''INSERT INTO high_scores (gamertag, score, timestamp)
+                                 VALUES (?, ?, ?)
+                                 ON CONFLICT(gamertag)
+                                 DO UPDATE SET score = MAX(score, excluded.score),
+                                               timestamp = CASE
+                                                   WHEN score < excluded.score THEN excluded.timestamp
+                                                   ELSE timestamp
+                                               END''',
+                              (gamertag, score, timestamp))
+            self.conn.commit()
+            self.leaderboard_cache = {}
+            self.history_cache = {}
+
+    def top_scores(self, limit=5):
+        """Returns the best (gamertag, score, timestamp) rows, highest first."""
+        rows = self.leaderboard_cache.get(limit)
+        if rows is None:
+            with self.lock:
+                rows = self.conn.execute(
+                    'SELECT gamertag, score, timestamp FROM high_scores ORDER BY score DESC LIMIT ?',
+                    (limit,)).fetchall()
+                self.leaderboard_cache[limit] = rows
+        return rows
+
+    def history(self, gamertag, limit=20):
+        """Returns a gamertag's most recent (score, timestamp) runs, oldest first."""
+        key = (gamertag, limit)
+        rows = self.history_cache.get(key)
+        if rows is None:
+            with self.lock:
+                rows = self.conn.execute(
+                    'SELECT score, timestamp FROM runs WHERE gamertag = ? ORDER BY id DESC LIMIT ?',
+                    (gamertag, limit)).fetchall()[::-1]
+                self.history_cache[key] = rows
+        return rows
+
+    def flush(self):
+        """Wait until every queued run has been written."""
+        self.pending.join()
+
+    def close(self):
+        """Write the remaining runs, stop the writer thread and close the connection."""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        with self.lock:
+            self.conn.close()
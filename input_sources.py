@@ -0,0 +1,213 @@
+import math
+import struct
+import time
+from hand_tracking import HandSample, HandTracker, InputSource, open_webcam, create_hand_model
+
+
+class ScriptedInput(InputSource):
+    """
+    Synthetic input source replacing the webcam hand tracker in simulations.
+    path maps the clock time to a normalized (x, y) index finger position, one sample per frame.
+    """
+
+    def __init__(self, clock, path=None):
+        self.clock = clock
+        self.path = path or self.sweep
+
+    @staticmethod
+    def sweep(t):
+        """Default path: a slow figure-eight across the lower half of the screen."""
+        return 0.5 + 0.4 * math.sin(t * 0.7), 0.75 + 0.15 * math.sin(t * 1.4)
+
+    def latest(self):
+        """Returns the scripted sample for the current clock time."""
+        x, y = self.path(self.clock())
+        return HandSample(x, y, self.clock())
+
+
+# Landmark files: an 8 byte header followed by (float64 seconds since the first sample, float32 x, float32 y) records
+LANDMARK_MAGIC = b'ADLMv001'
+LANDMARK_RECORD = struct.Struct('<dff')
+
+
+class LandmarkRecorder(InputSource):
+    """
+    Wraps another input source and writes every sample the game reads from it to a landmark file,
+    which ReplayInput can play back later.
+    """
+
+    def __init__(self, source, path):
+        self.source = source
+        self.clock = source.clock
+        self.file = open(path, 'wb')
+        self.file.write(LANDMARK_MAGIC)
+        self.first_timestamp = None
+        self.samples_recorded = 0
+
+    def latest(self):
+        sample = self.source.latest()
+        if sample is not None and self.file is not None:
+            if self.first_timestamp is None:
+                self.first_timestamp = sample.timestamp
+            self.file.write(LANDMARK_RECORD.pack(
+                sample.timestamp - self.first_timestamp, sample.x, sample.y))
+            self.samples_recorded += 1
+        return sample
+
+    def pause(self):
+        self.source.pause()
+
+    def resume(self):
+        self.source.resume()
+
+    def limit_inference_interval(self, interval=None):
+        self.source.limit_inference_interval(interval)
+
+    def stop(self):
+        """Stop the wrapped source and close the file."""
+        self.source.stop()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def load_landmarks(path):
+    """Reads a landmark file into a list of (seconds, x, y) tuples."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:len(LANDMARK_MAGIC)] != LANDMARK_MAGIC:
+        raise ValueError(f"{path} is not a landmark recording")
+    body = data[len(LANDMARK_MAGIC):]
+    usable = len(body) - len(body) % LANDMARK_RECORD.size
+    return list(LANDMARK_RECORD.iter_unpack(body[:usable]))
+
+
+class ReplayInput(InputSource):
+    """
+    Plays back a landmark recording against a clock, starting at the first call to latest().
+    Like HandTracker, it only returns samples that have not been read yet, and counts the ones skipped.
+    """
+
+    def __init__(self, path, clock=time.perf_counter, loop=False):
+        self.samples = load_landmarks(path)
+        self.clock = clock
+        self.loop = loop
+        self.start_time = None
+        self.paused_at = None
+        self.index = 0
+        self.samples_dropped = 0
+        self.duration = self.samples[-1][0] if self.samples else 0
+
+    def latest(self):
+        if not self.samples or self.paused_at is not None:
+            return None
+        now = self.clock()
+        if self.start_time is None:
+            self.start_time = now
+
+        elapsed = now - self.start_time
+        if self.loop and self.duration > 0 and elapsed > self.duration:
+            # Start the next pass over the recording
+            self.start_time += self.duration * (elapsed // self.duration)
+            elapsed = now - self.start_time
+            self.index = 0
+
+        newest = None
+        while self.index < len(self.samples) and self.samples[self.index][0] <= elapsed:
+            if newest is not None:
+                self.samples_dropped += 1
+            newest = self.samples[self.index]
+            self.index += 1
+        if newest is None:
+            return None
+        seconds, x, y = newest
+        return HandSample(x, y, self.start_time + seconds)
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = self.clock()
+
+    def resume(self):
+        """Continue from where the recording was paused."""
+        if self.paused_at is not None:
+            if self.start_time is not None:
+                self.start_time += self.clock() - self.paused_at
+            self.paused_at = None
+
+
+class VideoFileCapture:
+    """
+    Reads a video file through the same interface as the webcam, so HandTracker can run the full
+    MediaPipe pipeline on it. With realtime=True frames are delivered at the file's frame rate.
+    The video starts over when it ends.
+    """
+
+    def __init__(self, path, realtime=True):
+        import cv2
+
+        self.capture = cv2.VideoCapture(path)
+        self.realtime = realtime
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1 / fps if fps > 0 else 1 / 30
+        self.start_time = None
+        self.frames_read = 0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        import cv2
+
+        if self.realtime:
+            if self.start_time is None:
+                self.start_time = time.perf_counter()
+            delay = self.start_time + self.frames_read * self.frame_interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        control, frame = self.capture.read(image)
+        if not control:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            control, frame = self.capture.read(image)
+        self.frames_read += 1
+        return control, frame
+
+    def set(self, prop, value):
+        # Resolution changes from adaptive tracking do not apply to files
+        return False
+
+    def get(self, prop):
+        return self.capture.get(prop)
+
+    def release(self):
+        self.capture.release()
+
+
+INPUT_KINDS = ['synthetic', 'replay', 'video', 'webcam']
+
+
+def create_input_source(kind, clock=time.perf_counter, path=None, min_interval=1 / 60, roi=False):
+    """
+    Builds one of the INPUT_KINDS. replay and video need a file path.
+    video and webcam start a HandTracker that releases its capture when stopped, with region-of-interest
+    tracking if roi is True.
+    """
+    if kind == 'synthetic':
+        return ScriptedInput(clock)
+    if kind in ('replay', 'video') and path is None:
+        raise ValueError(f"Input source {kind!r} needs a file path")
+    if kind == 'replay':
+        return ReplayInput(path, clock)
+    if kind == 'video':
+        capture = VideoFileCapture(path)
+    elif kind == 'webcam':
+        capture = open_webcam()
+    else:
+        raise ValueError(f"Unknown input source {kind!r}, expected one of {INPUT_KINDS}")
+
+    if not capture.isOpened():
+        raise IOError(f"Could not open {path or 'webcam'}")
+    tracker = HandTracker(capture, create_hand_model(), min_interval=min_interval,
+                          roi=roi, adaptive=kind == 'webcam', owns_capture=True)
+    tracker.start()
+    return tracker
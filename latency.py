@@ -0,0 +1,120 @@
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram of durations, 1 ms per bucket by default. Adding a value never allocates.
+    """
+
+    def __init__(self, bucket_ms=1, max_ms=500):
+        self.bucket_ms = bucket_ms
+        self.counts = [0] * (max_ms // bucket_ms + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        milliseconds = seconds * 1000
+        bucket = min(int(milliseconds // self.bucket_ms), len(self.counts) - 1)
+        self.counts[max(bucket, 0)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, fraction):
+        """
+        Value (ms) below which the given fraction of the values falls, interpolated inside its bucket
+        and never above the largest value recorded.
+        """
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                value = (bucket + (target - seen) / count) * self.bucket_ms
+                return min(value, self.max)
+            seen += count
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.mean(), 2),
+            'p50_ms': round(self.percentile(0.5), 2),
+            'p95_ms': round(self.percentile(0.95), 2),
+            'max_ms': round(self.max, 2),
+        }
+
+
+class LatencyMonitor:
+    """
+    Follows hand samples from the camera to the screen and records how long each stage took:
+    capture -> inference start -> inference end -> filter output -> simulation consume -> present.
+    All timestamps come from the input source's clock. Only the newest sample is followed; a sample
+    replaced by a newer one before it reached the screen is not counted.
+    When the capture backend has no frame timestamp, the first stage (and total) start when the frame was
+    read instead, and it is recorded as read_to_inference rather than capture_to_inference.
+    """
+
+    STAGES = ['capture_to_inference', 'read_to_inference', 'inference', 'inference_to_filter',
+              'filter_to_simulation', 'simulation_to_present', 'total']
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded latencies (e.g. for a new session)."""
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+        self.pending = None
+        self.consumed_time = None
+
+    def filtered(self, sample):
+        """A new sample went through the hand filter."""
+        self.pending = (sample, self.clock())
+        self.consumed_time = None
+
+    def consumed(self):
+        """The simulation moved the ship using the newest filtered position."""
+        if self.pending is not None and self.consumed_time is None:
+            self.consumed_time = self.clock()
+
+    def presented(self):
+        """The frame showing the consumed position is on screen: record every stage of the sample."""
+        if self.consumed_time is None:
+            return
+        now = self.clock()
+        sample, filter_time = self.pending
+        if sample.inference_start is not None:
+            first_stage = 'capture_to_inference' if sample.device_timestamp else 'read_to_inference'
+            self.histograms[first_stage].add(sample.inference_start - sample.timestamp)
+            self.histograms['inference'].add(sample.inference_end - sample.inference_start)
+            self.histograms['inference_to_filter'].add(filter_time - sample.inference_end)
+        self.histograms['filter_to_simulation'].add(self.consumed_time - filter_time)
+        self.histograms['simulation_to_present'].add(now - self.consumed_time)
+        self.histograms['total'].add(now - sample.timestamp)
+        self.pending = None
+        self.consumed_time = None
+
+    def summary(self):
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def live_text(self):
+        """One line for the in-game display."""
+        total = self.histograms['total']
+        inference = self.histograms['inference']
+        return (f"LATENCY {total.mean():.0f}MS P95 {total.percentile(0.95):.0f}MS "
+                f"INFER {inference.mean():.0f}MS")
+
+    def report(self):
+        """Multi-line table of every stage, or an empty string if nothing was recorded."""
+        if not self.histograms['total'].count:
+            return ''
+        lines = [f"{'Input latency':<24}{'count':>7}{'mean':>9}{'p50':>7}{'p95':>7}{'max':>9}"]
+        for stage, histogram in self.histograms.items():
+            if histogram.count:
+                lines.append(f"  {stage:<22}{histogram.count:>7}{histogram.mean():>7.1f}ms"
+                             f"{histogram.percentile(0.5):>5.1f}ms{histogram.percentile(0.95):>5.1f}ms"
+                             f"{histogram.max:>7.1f}ms")
+        return '\n'.join(lines)
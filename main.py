@@ -6,14 +6,33 @@ A vertical scroller game that uses hand gestures for player movements using comp
 Last updated on (D/M/Y): 06/08/2024
 '''
 
+from startup_timing import STARTUP
 from tkinter import *
 from PIL import ImageTk, Image
 from os.path import join
-from game import Game
+import argparse
+import threading
+import time
 import webbrowser
 
 
 # Functions
+def parse_args():
+    """Reads the display and recording options passed to the launcher (e.g. by a kiosk shortcut)."""
+    parser = argparse.ArgumentParser(description='Launch astroDodger.')
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help='Internal render resolution as a fraction of 1280x720 (e.g. 0.5 draws at 640x360).')
+    parser.add_argument('--fullscreen', action='store_true',
+                        help='Scale the game to the whole display.')
+    parser.add_argument('--max-fps', type=int,
+                        help='Frame rate cap during gameplay (0 for uncapped, 60 by default).')
+    parser.add_argument('--vsync', action='store_true',
+                        help='Present frames in sync with the display.')
+    parser.add_argument('--record', metavar='PATH',
+                        help='Record the hand landmark stream of the session to this file, for replay in simulation.py.')
+    return parser.parse_args()
+
+
 def start_win_move(event):
     root.x = event.x
     root.y = event.y
@@ -63,10 +82,27 @@ def create_button(parent, text, bg_color, fg_color, command, **kwargs):
     return button
 
 
+def warm_up_imports():
+    """Imports the game and its heavy dependencies in the background while the splash window is open."""
+    start = time.perf_counter()
+    import game
+    from hand_tracking import import_mediapipe
+    STARTUP.record('import game', time.perf_counter() - start)
+    import_mediapipe()
+    STARTUP.record('import game + mediapipe', time.perf_counter() - start)
+
+
 def start_game():
     """Starts the astroDodger game"""
     root.destroy()
-    game = Game()
+
+    # Picks up the modules already imported by the warm-up thread, waiting for it if needed
+    start = time.perf_counter()
+    from game import Game
+    STARTUP.record('wait for game import', time.perf_counter() - start)
+
+    game = Game(render_scale=args.render_scale, fullscreen=args.fullscreen,
+                max_fps=args.max_fps, vsync=args.vsync, record_input=args.record)
     game.start()
 
 
@@ -79,6 +115,7 @@ def enable_start_button():
 
 
 # Main window setup
+args = parse_args()
 root = Tk()
 root.overrideredirect(True)
 root.attributes('-topmost', True)
@@ -151,4 +188,8 @@ terms_bttn = Button(root, text="astroDodger Terms",
                     command=openlink)
 terms_bttn.place(relx=0.50, rely=0.96, anchor=CENTER)
 
+# Warm up the heavy imports while the user reads the splash screen
+threading.Thread(target=warm_up_imports, name='ImportWarmUp', daemon=True).start()
+STARTUP.mark('splash_ready')
+
 root.mainloop()
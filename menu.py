@@ -0,0 +1,84 @@
+import time
+import pygame
+
+
+class MenuTimer:
+    """
+    Repeating timer driven by the real clock, used for blinking text and other menu animations.
+    """
+
+    def __init__(self, interval, start_on=True):
+        self.interval = interval
+        self.on = start_on
+        self.ticks = 0
+        self.next_time = time.perf_counter() + interval
+
+    def update(self, now):
+        """Count and toggle every interval that has passed. Returns True if it ticked."""
+        if now < self.next_time:
+            return False
+        ticks = int((now - self.next_time) // self.interval) + 1
+        self.next_time += ticks * self.interval
+        self.ticks += ticks
+        if ticks % 2:
+            self.on = not self.on
+        return True
+
+
+class MenuLoop:
+    """
+    Shared loop for the menu screens. It caps the frame rate, sleeps on the event queue while nothing changes,
+    and only asks the screen to redraw after input or when one of its timers ticks.
+    """
+
+    def __init__(self, max_fps=30, flip=pygame.display.flip):
+        self.max_fps = max_fps
+        self.flip = flip
+        self.clock = pygame.time.Clock()
+        self.timers = []
+        self.needs_redraw = True
+
+    def add_timer(self, interval, start_on=True):
+        """Create a MenuTimer that wakes the loop up whenever it ticks."""
+        timer = MenuTimer(interval, start_on)
+        self.timers.append(timer)
+        return timer
+
+    def invalidate(self):
+        """Force a redraw on the next frame (e.g. when state changed outside an event)."""
+        self.needs_redraw = True
+
+    def events(self):
+        """
+        Returns the pending events, waiting for the next event or timer tick when there is nothing to redraw.
+        Any event or timer tick marks the screen for redrawing.
+        """
+        self.clock.tick(self.max_fps)
+
+        if self.needs_redraw:
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait(self.wait_timeout())
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+
+        if events:
+            self.needs_redraw = True
+
+        now = time.perf_counter()
+        for timer in self.timers:
+            if timer.update(now):
+                self.needs_redraw = True
+        return events
+
+    def wait_timeout(self):
+        """Milliseconds until the next timer is due (0 waits for an event with no timeout)."""
+        if not self.timers:
+            return 0
+        due = min(timer.next_time for timer in self.timers) - time.perf_counter()
+        return max(1, int(due * 1000) + 1)
+
+    def present(self):
+        """Show the redrawn screen."""
+        self.flip()
+        self.needs_redraw = False
@@ -0,0 +1,116 @@
+import cProfile
+import csv
+import io
+import json
+import pstats
+import time
+
+
+class FrameProfiler:
+    """
+    Low-overhead per-frame profiler. Stage timings are accumulated into preallocated rows of a ring buffer
+    holding the last `capacity` frames, which can be exported as a CSV or JSON trace.
+    It can also run cProfile over the next N frames on demand.
+    """
+
+    STAGES = ('background', 'spawn', 'collisions', 'sprite_update', 'draw', 'ui', 'alert', 'present')
+    BACKGROUND, SPAWN, COLLISIONS, SPRITE_UPDATE, DRAW, UI, ALERT, PRESENT = range(len(STAGES))
+
+    def __init__(self, capacity=600):
+        self.clock = time.perf_counter
+        self.capacity = capacity
+        self.rows = [[0.0] * len(self.STAGES) for _ in range(capacity)]
+        self.frame_times = [0.0] * capacity
+        self.index = 0
+        self.frames = 0
+        self.row = self.rows[0]
+        self.frame_start = self.clock()
+
+        # On-demand cProfile capture
+        self.capture_profile = None
+        self.capture_frames_left = 0
+        self.capture_path = None
+
+    def lap(self, stage, start):
+        """Add the time since start to a stage of the current frame and return the current time."""
+        now = self.clock()
+        self.row[stage] += now - start
+        return now
+
+    def end_frame(self):
+        """Close the current frame and start the next ring buffer row."""
+        now = self.clock()
+        self.frame_times[self.index] = now - self.frame_start
+        self.frame_start = now
+        self.frames += 1
+        self.index = (self.index + 1) % self.capacity
+        self.row = self.rows[self.index]
+        for stage in range(len(self.row)):
+            self.row[stage] = 0.0
+
+        if self.capture_profile is not None:
+            self.capture_frames_left -= 1
+            if self.capture_frames_left <= 0:
+                self.finish_capture()
+
+    def recent(self, count=None):
+        """Returns (frame_time, stage_row) pairs of the recorded frames, oldest first."""
+        # The row at self.index belongs to the frame in progress
+        available = min(self.frames, self.capacity - 1)
+        count = available if count is None else min(count, available)
+        start = (self.index - count) % self.capacity
+        return [(self.frame_times[(start + i) % self.capacity], self.rows[(start + i) % self.capacity])
+                for i in range(count)]
+
+    def frame_time_percentiles(self, fractions=(0.5, 0.95, 0.99), count=None):
+        """Returns the frame time (ms) at each fraction of the recent frames."""
+        times = sorted(frame_time for frame_time, _ in self.recent(count))
+        if not times:
+            return [0] * len(fractions)
+        return [1000 * times[min(len(times) - 1, int(fraction * len(times)))] for fraction in fractions]
+
+    def stage_means(self, count=None):
+        """Returns the mean time (ms) of every stage over the recent frames."""
+        frames = self.recent(count)
+        if not frames:
+            return {stage: 0 for stage in self.STAGES}
+        return {stage: 1000 * sum(row[index] for _, row in frames) / len(frames)
+                for index, stage in enumerate(self.STAGES)}
+
+    def export(self, path):
+        """Write the recorded frames as CSV, or JSON when path ends in .json. Times are in milliseconds."""
+        frames = self.recent()
+        first_frame = self.frames - len(frames)
+        if path.endswith('.json'):
+            trace = [dict(frame=first_frame + i, frame_ms=1000 * frame_time,
+                          **{stage: 1000 * row[index] for index, stage in enumerate(self.STAGES)})
+                     for i, (frame_time, row) in enumerate(frames)]
+            with open(path, 'w') as file:
+                json.dump(trace, file, indent=1)
+        else:
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['frame', 'frame_ms', *self.STAGES])
+                for i, (frame_time, row) in enumerate(frames):
+                    writer.writerow([first_frame + i, f'{1000 * frame_time:.3f}',
+                                     *(f'{1000 * value:.3f}' for value in row)])
+        return path
+
+    def start_capture(self, frames, path):
+        """Run cProfile over the next `frames` frames and save the stats to path."""
+        if self.capture_profile is not None:
+            return
+        self.capture_frames_left = frames
+        self.capture_path = path
+        self.capture_profile = cProfile.Profile()
+        self.capture_profile.enable()
+
+    def finish_capture(self):
+        """Stop the cProfile capture, save it and print the most expensive functions."""
+        self.capture_profile.disable()
+        self.capture_profile.dump_stats(self.capture_path)
+        output = io.StringIO()
+        pstats.Stats(self.capture_profile, stream=output).sort_stats('cumulative').print_stats(15)
+        print(f"Saved profile to {self.capture_path}")
+        print(output.getvalue())
+        self.capture_profile = None
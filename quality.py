@@ -0,0 +1,65 @@
+from collections import deque
+
+
+class QualityGovernor:
+    """
+    Sheds rendering and tracking work when frames run over budget, one level at a time in LEVELS order,
+    and restores it once there is headroom again.
+
+    Hysteresis keeps it from oscillating: it steps down when the average work time of the last
+    down_window frames exceeds down_ratio of the budget, but only steps up when the average of the
+    last up_window frames is under up_ratio of it. After every change it waits cooldown frames.
+    Levels listed in skip_levels (e.g. ones that change nothing in the current render mode) are stepped over.
+    Every transition is logged, and the most recent ones are kept in a bounded deque for the performance overlay.
+    """
+
+    LEVELS = ('full', 'no_rotation', 'plain_alert', 'coarse_background', 'reduced_inference', 'circle_collisions')
+
+    def __init__(self, budget, apply, down_window=30, up_window=180, down_ratio=0.9, up_ratio=0.6, cooldown=60,
+                 skip_levels=(), history=8):
+        self.budget = budget
+        self.apply = apply
+        self.skip_levels = set(skip_levels)
+        self.down_window = down_window
+        self.down_ratio = down_ratio
+        self.up_ratio = up_ratio
+        self.cooldown = cooldown
+        self.work_times = deque(maxlen=up_window)
+        self.level = 0
+        self.frames_since_change = 0
+        self.transitions = deque(maxlen=history)
+
+    def update(self, work_time):
+        """Record the time one frame spent working (excluding any frame cap sleep) and adjust the level."""
+        self.work_times.append(work_time)
+        self.frames_since_change += 1
+        if self.frames_since_change < self.cooldown or len(self.work_times) < self.down_window:
+            return
+
+        recent = list(self.work_times)[-self.down_window:]
+        recent_average = sum(recent) / len(recent)
+        lower = self.next_level(1)
+        higher = self.next_level(-1)
+        if recent_average > self.budget * self.down_ratio and lower is not None:
+            self.set_level(lower, recent_average)
+        elif (len(self.work_times) == self.work_times.maxlen and higher is not None and
+              sum(self.work_times) / len(self.work_times) < self.budget * self.up_ratio):
+            self.set_level(higher, sum(self.work_times) / len(self.work_times))
+
+    def next_level(self, direction):
+        """Returns the next level in a direction (1 sheds load, -1 restores it) that is not skipped, or None."""
+        level = self.level + direction
+        while level in self.skip_levels:
+            level += direction
+        return level if 0 <= level < len(self.LEVELS) else None
+
+    def set_level(self, level, work_time):
+        """Apply a quality level, log the transition and remember it for the overlay."""
+        transition = (f"{self.LEVELS[self.level]} -> {self.LEVELS[level]} "
+                      f"{1000 * work_time:.1f}/{1000 * self.budget:.1f}MS")
+        print(f"Quality: {transition}")
+        self.transitions.append(transition)
+        self.level = level
+        self.apply(level)
+        self.work_times.clear()
+        self.frames_since_change = 0
@@ -0,0 +1,62 @@
+import pygame
+
+
+class RenderScale:
+    """
+    Maps the fixed simulation space (the game's SCREEN_WIDTH x SCREEN_HEIGHT) onto the internal render resolution.
+    Gameplay keeps working in simulation coordinates; only drawing goes through this class, which scales
+    positions at draw time and images once, caching them by their source Surface.
+    At a factor of 1 every method hands its argument back unchanged.
+    """
+
+    def __init__(self, logical_size, factor=1.0):
+        self.logical_size = logical_size
+        self.factor = factor
+        self.render_size = (max(1, round(logical_size[0] * factor)), max(1, round(logical_size[1] * factor)))
+        self.identity = self.render_size == tuple(logical_size)
+        self.images = {}
+
+    def image(self, surface):
+        """Returns the surface scaled to the render resolution, scaling it on first use."""
+        if self.identity:
+            return surface
+        scaled = self.images.get(surface)
+        if scaled is None:
+            width, height = surface.get_size()
+            scaled = pygame.transform.smoothscale(surface, (self.pixels(width), self.pixels(height)))
+            self.images[surface] = scaled
+        return scaled
+
+    def preload(self, surfaces):
+        """Scale every surface up front so no scaling happens during gameplay."""
+        for surface in surfaces:
+            self.image(surface)
+
+    def pixels(self, length):
+        """Scales a length such as a size or outline width to whole render pixels (at least 1)."""
+        if self.identity:
+            return length
+        return max(1, round(length * self.factor))
+
+    def point(self, x, y):
+        """Scales a simulation position to a render position."""
+        if self.identity:
+            return x, y
+        return x * self.factor, y * self.factor
+
+    def rect(self, rect):
+        """Returns the top-left render position of a simulation rect, for blitting its scaled image."""
+        if self.identity:
+            return rect
+        return rect.x * self.factor, rect.y * self.factor
+
+    def to_logical(self, position):
+        """Maps a render position (e.g. the mouse under pygame.SCALED) back to simulation coordinates."""
+        if self.identity:
+            return position
+        return int(position[0] / self.factor), int(position[1] / self.factor)
+
+    def present(self, canvas, display):
+        """Scale a full-size canvas onto the display surface, when the two differ."""
+        if canvas is not display:
+            pygame.transform.smoothscale(canvas, self.render_size, display)
@@ -0,0 +1,61 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResourceLoader:
+    """
+    Runs named loading jobs on worker threads and reports real progress for the loading screen.
+    Jobs run concurrently, so the total loading time tends towards the longest single job.
+    """
+
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='ResourceLoader')
+        self.jobs = {}
+        self.timings = {}
+
+    def submit(self, name, label, function, *args):
+        """Start a job; label is the text shown on the loading screen while it runs."""
+        self.jobs[name] = (label, self.executor.submit(
+            self.run_timed, name, function, *args))
+
+    def run_timed(self, name, function, *args):
+        """Run a job and record how long it took."""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def progress(self):
+        """Returns the fraction of jobs that have finished, between 0 and 1."""
+        if not self.jobs:
+            return 1
+        finished = sum(future.done() for _, future in self.jobs.values())
+        return finished / len(self.jobs)
+
+    def current_label(self):
+        """Returns the label of the first job still running, or None when everything is loaded."""
+        for label, future in self.jobs.values():
+            if not future.done():
+                return label
+        return None
+
+    def done(self):
+        return all(future.done() for _, future in self.jobs.values())
+
+    def result(self, name):
+        """Waits for a job and returns its result, re-raising any error it hit."""
+        return self.jobs[name][1].result()
+
+    def take(self, name):
+        """Returns a job's result and forgets it, or None if there is no such job."""
+        if name not in self.jobs:
+            return None
+        result = self.result(name)
+        del self.jobs[name]
+        return result
+
+    def shutdown(self):
+        """Stop accepting jobs and cancel the ones that have not started."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
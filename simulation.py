@@ -0,0 +1,83 @@
+import argparse
+import time
+from input_sources import INPUT_KINDS, create_input_source
+from filters import FILTERS
+
+
+class SimulationClock:
+    """
+    Injectable game clock that advances by a fixed step per simulated frame instead of following wall-clock time.
+    """
+
+    def __init__(self, step=1 / 60, start=0.0):
+        self.step = step
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self):
+        """Move the clock forward by one step."""
+        self.now += self.step
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run astroDodger headless for a number of simulated frames.')
+    parser.add_argument('--frames', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--render', action='store_true',
+                        help='Also draw every frame to the dummy display.')
+    parser.add_argument('--entity-store', action='store_true',
+                        help='Use the vectorized NumPy entity store for asteroids and shields.')
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help='Render with the dirty-rect renderer.')
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help='Internal render resolution as a fraction of 1280x720 (e.g. 0.5 draws at 640x360).')
+    parser.add_argument('--input', choices=INPUT_KINDS, default='synthetic',
+                        help='Where the hand position comes from (default: a synthetic path).')
+    parser.add_argument('--input-file',
+                        help='Landmark recording for --input replay, or video file for --input video.')
+    parser.add_argument('--roi', action='store_true',
+                        help='Crop hand inference to a region of interest for --input video/webcam, to compare with full-frame tracking.')
+    parser.add_argument('--filter', choices=list(FILTERS), default='ema',
+                        help='Filter that smooths the hand position.')
+    parser.add_argument('--trace',
+                        help='Export the per-frame stage timings of the last 600 frames (.csv or .json).')
+    parser.add_argument('--cprofile', type=int, metavar='FRAMES',
+                        help='Profile the first FRAMES frames with cProfile and save the stats to simulation.prof.')
+    parser.add_argument('--record',
+                        help='Write the landmark stream the game reads to this file.')
+    args = parser.parse_args()
+
+    from game import Game
+
+    clock = SimulationClock()
+    source = create_input_source(args.input, clock, args.input_file, roi=args.roi)
+    game = Game(headless=True, seed=args.seed, clock=clock, input_source=source,
+                entity_store=args.entity_store, dirty_rects=args.dirty_rects, record_input=args.record,
+                hand_filter=args.filter, render_scale=args.render_scale)
+    if args.cprofile:
+        game.profiler.start_capture(args.cprofile, 'simulation.prof')
+    start = time.perf_counter()
+    summary = game.run_simulation(args.frames, render=args.render)
+    elapsed = time.perf_counter() - start
+    if game.profiler.capture_profile is not None:
+        game.profiler.finish_capture()
+    print(summary)
+    report = game.latency.report()
+    if report:
+        print(report)
+    if hasattr(source, 'stats'):
+        stats = source.stats()
+        print(f"Hand tracking: detected in {stats['detections']}/{stats['frames_captured']} frames "
+              f"({100 * stats['detections'] / max(1, stats['frames_captured']):.1f}%), "
+              f"{stats['reacquisitions']} full-frame reacquisitions, {stats['roi_misses']} ROI misses, "
+              f"{stats['roi_recenters']} ROI re-centres, inference {stats['inference_ms_avg']:.1f}ms avg")
+    print(f"{summary['frames']} frames in {elapsed:.2f}s ({summary['frames'] / elapsed:.0f} frames/s)")
+    if args.trace:
+        print(f"Saved frame trace to {game.profiler.export(args.trace)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+class SpritePool:
+    """
+    Pre-allocated pool of sprites that are reset and reused on spawn instead of being reconstructed.
+    Sprites must provide reset(groups, ...) and return themselves through release() when killed.
+    """
+
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.free = [self.create() for _ in range(capacity)]
+
+    def create(self):
+        """Build a new detached sprite that knows which pool it belongs to."""
+        sprite = self.factory()
+        sprite.pool = self
+        return sprite
+
+    def acquire(self, groups, *args):
+        """Reset a pooled sprite (or build a new one if the pool is empty) and add it to the groups."""
+        if self.free:
+            sprite = self.free.pop()
+            self.hits += 1
+        else:
+            sprite = self.create()
+            self.misses += 1
+        sprite.reset(groups, *args)
+        return sprite
+
+    def release(self, sprite):
+        """Return a killed sprite to the pool, dropping it if the pool is already full."""
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
+
+    def stats(self):
+        """Returns pool hits, misses and the number of free sprites."""
+        return {'hits': self.hits, 'misses': self.misses, 'free': len(self.free)}
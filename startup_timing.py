@@ -0,0 +1,42 @@
+import time
+
+
+class StartupTimer:
+    """
+    Records how long the launcher and game take to start: import time, asset loading and time to the first frame.
+    Events are measured from a named start point: 'launch' is the moment this module was first imported,
+    and later points (such as the loading screen appearing) leave out the time spent waiting on the user.
+    """
+
+    def __init__(self):
+        self.starts = {'launch': time.perf_counter()}
+        self.durations = {}
+        self.events = {}
+        self.reported = False
+
+    def record(self, name, seconds):
+        """Store the duration of a startup step."""
+        self.durations[name] = seconds
+
+    def start(self, name):
+        """Set a start point that later events can be measured from."""
+        self.starts.setdefault(name, time.perf_counter())
+
+    def mark(self, name, since='launch'):
+        """Store the time since a start point at which an event first happened."""
+        if since in self.starts and name not in self.events:
+            self.events[name] = (since, time.perf_counter() - self.starts[since])
+
+    def report(self):
+        """Returns the startup timing report as text, or None if it was already reported."""
+        if self.reported:
+            return None
+        self.reported = True
+        lines = ['Startup timing (ms):']
+        lines += [f'  {name:<28}{seconds * 1000:>10.1f}' for name, seconds in self.durations.items()]
+        lines += [f'  @ {f"{name} (from {since})":<26}{seconds * 1000:>10.1f}'
+                  for name, (since, seconds) in self.events.items()]
+        return '\n'.join(lines)
+
+
+STARTUP = StartupTimer()
@@ -0,0 +1,65 @@
+import pytest
+from filters import FILTERS, EMAFilter, HandFilter, create_filter, evaluate_filter
+
+
+def test_create_filter_starts_at_position():
+    for name in FILTERS:
+        assert create_filter(name, 640, 360).position(0) == (640, 360)
+
+
+def test_create_filter_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        create_filter('median')
+
+
+@pytest.mark.parametrize('name', ['one_euro', 'kalman'])
+def test_filter_converges_on_still_hand(name):
+    hand_filter = create_filter(name, 0, 0)
+    for i in range(120):
+        hand_filter.update(500, 300, i / 60)
+    x, y = hand_filter.position(2)
+    assert x == pytest.approx(500, abs=1)
+    assert y == pytest.approx(300, abs=1)
+
+
+@pytest.mark.parametrize('name', ['one_euro', 'kalman'])
+def test_filter_extrapolates_steady_motion(name):
+    hand_filter = create_filter(name, 0, 300)
+    for i in range(120):
+        hand_filter.update(i * 5, 300, i / 60)
+    # The hand moves 300 px/s, so a frame later it should be ahead of the last sample
+    x, _ = hand_filter.position(119 / 60 + 1 / 60)
+    assert x > 119 * 5
+
+
+@pytest.mark.parametrize('name', ['one_euro', 'kalman'])
+def test_filter_ignores_stale_timestamps(name):
+    hand_filter = create_filter(name, 0, 0)
+    hand_filter.update(100, 100, 1.0)
+    hand_filter.update(900, 900, 0.5)
+    assert hand_filter.position(1.0) == (100, 100)
+
+
+def test_extrapolation_is_capped():
+    hand_filter = create_filter('kalman', 0, 0)
+    for i in range(60):
+        hand_filter.update(i * 10, 0, i / 60)
+    assert hand_filter.position(100) == hand_filter.position(59 / 60 + HandFilter.MAX_EXTRAPOLATION)
+
+
+def test_ema_filter_ignores_time():
+    hand_filter = EMAFilter(0, 0)
+    hand_filter.update(100, 100, 0)
+    assert hand_filter.position(0) == hand_filter.position(10)
+
+
+def test_evaluate_filter_on_still_samples():
+    samples = [(i / 60, 0.5, 0.5) for i in range(60)]
+    result = evaluate_filter(create_filter('one_euro', 640, 360), samples)
+    assert result['error'] == pytest.approx(0)
+    assert result['jitter'] == pytest.approx(0)
+
+
+def test_hand_filter_requires_update():
+    with pytest.raises(TypeError):
+        HandFilter()
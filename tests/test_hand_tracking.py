@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+import pytest
+from hand_tracking import HandTracker, TRACKING_WIDTH, TRACKING_HEIGHT
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('cv2')
+
+
+def hand_at(center_x, center_y, size=0.1):
+    """21 landmarks spread over a square around a point, with the index finger tip at the top left corner."""
+    points = [(center_x - size / 2 + size * (i % 5) / 4, center_y - size / 2 + size * (i // 5) / 4)
+              for i in range(21)]
+    points[HandTracker.INDEX_FINGER_TIP] = (center_x - size / 2, center_y - size / 2)
+    return points
+
+
+class FakeHandModel:
+    """
+    Stands in for MediaPipe Hands. Each process() call returns the next scripted hand, given in full-frame
+    coordinates and converted to the coordinates of the image it was passed (None for no hand).
+    """
+
+    def __init__(self, tracker, hands):
+        self.tracker = tracker
+        self.hands = list(hands)
+        self.shapes = []
+
+    def process(self, rgb):
+        self.shapes.append(rgb.shape[:2])
+        hand = self.hands.pop(0)
+        if hand is None:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        left, top, right, bottom = self.tracker.roi or (0, 0, TRACKING_WIDTH, TRACKING_HEIGHT)
+        landmark = [SimpleNamespace(x=(x * TRACKING_WIDTH - left) / (right - left),
+                                    y=(y * TRACKING_HEIGHT - top) / (bottom - top)) for x, y in hand]
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmark)])
+
+
+class FakeCapture:
+    """Webcam stand-in delivering a fixed number of blank frames, then stopping the tracker."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.tracker = None
+
+    def read(self, image=None):
+        self.frames -= 1
+        if self.frames == 0:
+            self.tracker.running = False
+        return True, np.zeros((TRACKING_HEIGHT, TRACKING_WIDTH, 3), dtype=np.uint8)
+
+    def get(self, prop):
+        return 0
+
+    def set(self, prop, value):
+        return True
+
+
+def make_tracker(hands, roi):
+    capture = FakeCapture(len(hands))
+    tracker = HandTracker(capture, None, roi=roi)
+    capture.tracker = tracker
+    tracker.hand = FakeHandModel(tracker, hands)
+    return tracker
+
+
+def run(tracker):
+    tracker.running = True
+    tracker.run()
+
+
+def test_full_frame_detection_counts_and_mirrors():
+    tracker = make_tracker([hand_at(0.3, 0.4), None, hand_at(0.3, 0.4)], roi=False)
+    run(tracker)
+    assert tracker.detections == 2
+    assert tracker.reacquisitions == 0
+    assert tracker.roi_misses == 0
+    assert tracker.hand.shapes == [(TRACKING_HEIGHT, TRACKING_WIDTH)] * 3
+    sample = tracker.latest()
+    assert sample.x == pytest.approx(1 - 0.25)
+    assert sample.y == pytest.approx(0.35)
+
+
+def test_roi_crops_after_reacquisition_and_maps_back_to_the_frame():
+    tracker = make_tracker([hand_at(0.5, 0.5), hand_at(0.52, 0.5)], roi=True)
+    first = tracker.detect(np.zeros((TRACKING_HEIGHT, TRACKING_WIDTH, 3), dtype=np.uint8))
+    assert tracker.reacquisitions == 1
+    assert first == pytest.approx((0.45, 0.45))
+
+    left, top, right, bottom = tracker.roi
+    second = tracker.detect(np.zeros((TRACKING_HEIGHT, TRACKING_WIDTH, 3), dtype=np.uint8))
+    assert tracker.hand.shapes[1] == (bottom - top, right - left)
+    assert second == pytest.approx((0.47, 0.45))
+    assert tracker.roi_detections == 1
+    assert tracker.roi == (left, top, right, bottom)  # Still well inside, so the region stays put
+
+
+def test_losing_the_hand_in_the_roi_falls_back_to_the_full_frame():
+    tracker = make_tracker([hand_at(0.5, 0.5), None, hand_at(0.5, 0.5)], roi=True)
+    run(tracker)
+    assert tracker.detections == 2
+    assert tracker.roi_misses == 1
+    assert tracker.reacquisitions == 2
+    assert tracker.hand.shapes[2] == (TRACKING_HEIGHT, TRACKING_WIDTH)
+
+
+def test_hand_near_the_roi_edge_recenters_it():
+    tracker = make_tracker([hand_at(0.5, 0.5), hand_at(0.62, 0.5)], roi=True)
+    frame = np.zeros((TRACKING_HEIGHT, TRACKING_WIDTH, 3), dtype=np.uint8)
+    tracker.detect(frame)
+    first_roi = tracker.roi
+    tracker.detect(frame)
+    assert tracker.roi_recenters == 1
+    assert tracker.roi != first_roi
+
+
+def test_region_around_has_a_minimum_size_and_stays_in_the_frame():
+    tracker = HandTracker(None, None, roi=True)
+    left, top, right, bottom = tracker.region_around(hand_at(0.5, 0.5, size=0.01), 320, 240)
+    assert right - left >= HandTracker.ROI_MIN_SIZE * 320
+    assert bottom - top >= HandTracker.ROI_MIN_SIZE * 240
+
+    left, top, right, bottom = tracker.region_around(hand_at(0.02, 0.97), 320, 240)
+    assert left == 0 and bottom == 240
+    assert right < 320 and top > 0
+
+
+def test_inside_region_ignores_edges_on_the_frame_border():
+    tracker = HandTracker(None, None, roi=True)
+    tracker.roi = (100, 60, 220, 180)
+    assert tracker.inside_region(hand_at(0.5, 0.5), 320, 240)
+    assert not tracker.inside_region(hand_at(0.35, 0.5), 320, 240)
+
+    # A region touching the left border never needs re-centring to the left
+    tracker.roi = (0, 60, 120, 180)
+    assert tracker.inside_region(hand_at(0.03, 0.5, size=0.05), 320, 240)
@@ -0,0 +1,79 @@
+import pytest
+from high_scores import HighScoreStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HighScoreStore(str(tmp_path / 'scores' / 'high_scores.db'))
+    yield store
+    store.close()
+
+
+def test_best_score_keeps_the_timestamp_it_was_set_at(store):
+    store.write_run('ace', 10, '2024-01-01 10:00:00')
+    store.write_run('ace', 5, '2024-01-02 10:00:00')
+    assert store.top_scores() == [('ace', 10, '2024-01-01 10:00:00')]
+
+    store.write_run('ace', 10, '2024-01-03 10:00:00')
+    assert store.top_scores() == [('ace', 10, '2024-01-01 10:00:00')]
+
+    store.write_run('ace', 12, '2024-01-04 10:00:00')
+    assert store.top_scores() == [('ace', 12, '2024-01-04 10:00:00')]
+
+
+def test_top_scores_are_ordered_and_limited(store):
+    for i, gamertag in enumerate(['a', 'b', 'c', 'd']):
+        store.write_run(gamertag, i * 10, '2024-01-01 10:00:00')
+    assert [row[0] for row in store.top_scores(3)] == ['d', 'c', 'b']
+
+
+def test_every_run_is_recorded(store):
+    for score in (3, 9, 1):
+        store.save('ace', score)
+    store.save('bob', 4)
+    store.flush()
+    count, = store.conn.execute('SELECT COUNT(*) FROM runs').fetchone()
+    assert count == 4
+    assert [score for score, _ in store.history('ace')] == [3, 9, 1]
+
+
+def test_history_returns_the_newest_runs_oldest_first(store):
+    for score in range(10):
+        store.write_run('ace', score, f'2024-01-01 10:00:{score:02}')
+    assert [score for score, _ in store.history('ace', limit=3)] == [7, 8, 9]
+    assert store.history('nobody') == []
+
+
+def test_cached_queries_refresh_when_a_write_lands(store):
+    store.write_run('ace', 10, '2024-01-01 10:00:00')
+    assert store.top_scores() == [('ace', 10, '2024-01-01 10:00:00')]
+    assert len(store.history('ace')) == 1
+
+    # A change that does not go through the store leaves the cached results stale
+    store.conn.execute("UPDATE high_scores SET score = 99 WHERE gamertag = 'ace'")
+    store.conn.commit()
+    assert store.top_scores()[0][1] == 10
+
+    store.save('ace', 20)
+    store.flush()
+    assert store.top_scores()[0][1] == 99
+    assert len(store.history('ace')) == 2
+
+
+def test_close_writes_queued_runs(tmp_path):
+    path = str(tmp_path / 'high_scores.db')
+    store = HighScoreStore(path)
+    store.save('ace', 7)
+    store.close()
+
+    reopened = HighScoreStore(path)
+    assert reopened.top_scores()[0][:2] == ('ace', 7)
+    reopened.close()
+
+
+def test_in_memory_store():
+    store = HighScoreStore(':memory:')
+    store.save('ace', 7)
+    store.flush()
+    assert store.top_scores()[0][:2] == ('ace', 7)
+    store.close()
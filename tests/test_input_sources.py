@@ -0,0 +1,52 @@
+import pytest
+from hand_tracking import HandTracker
+from input_sources import InputSource, LandmarkRecorder, ReplayInput, ScriptedInput, create_input_source
+from simulation import SimulationClock
+
+
+def test_input_source_requires_latest():
+    with pytest.raises(TypeError):
+        InputSource()
+
+    class Incomplete(InputSource):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_every_source_implements_the_interface():
+    for source_class in (HandTracker, ScriptedInput, LandmarkRecorder, ReplayInput):
+        assert issubclass(source_class, InputSource)
+
+
+def test_recording_replays_the_same_samples(tmp_path):
+    path = tmp_path / 'hand.lm'
+    clock = SimulationClock()
+    recorder = LandmarkRecorder(ScriptedInput(clock), path)
+    recorded = []
+    for _ in range(10):
+        clock.advance()
+        sample = recorder.latest()
+        recorded.append((sample.x, sample.y))
+    recorder.stop()
+
+    # A hair slower than the recording, so rounding in the accumulated clock never delays a sample
+    replay_clock = SimulationClock(step=1 / 60 + 1e-9)
+    replay = ReplayInput(path, replay_clock)
+    replayed = []
+    for _ in range(10):
+        sample = replay.latest()
+        replayed.append((sample.x, sample.y))
+        replay_clock.advance()
+    # Positions are stored as float32
+    for (x, y), (recorded_x, recorded_y) in zip(replayed, recorded):
+        assert x == pytest.approx(recorded_x, abs=1e-6)
+        assert y == pytest.approx(recorded_y, abs=1e-6)
+    assert replay.samples_dropped == 0
+
+
+@pytest.mark.parametrize('kind', ['replay', 'video'])
+def test_file_sources_need_a_path(kind):
+    with pytest.raises(ValueError):
+        create_input_source(kind)
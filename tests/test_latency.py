@@ -0,0 +1,84 @@
+import pytest
+from hand_tracking import HandSample
+from latency import LatencyHistogram, LatencyMonitor
+
+
+def test_histogram_percentiles_stay_within_recorded_values():
+    histogram = LatencyHistogram()
+    for milliseconds in range(1, 101):
+        histogram.add(milliseconds / 1000)
+    assert histogram.percentile(0.5) == pytest.approx(50, abs=1)
+    assert histogram.percentile(0.95) == pytest.approx(95, abs=1)
+    assert histogram.percentile(1.0) <= histogram.max == pytest.approx(100)
+
+
+def test_histogram_clamps_long_durations_into_last_bucket():
+    histogram = LatencyHistogram(max_ms=10)
+    histogram.add(5.0)
+    assert histogram.counts[-1] == 1
+    assert histogram.max == pytest.approx(5000)
+    assert histogram.percentile(0.5) <= histogram.max
+
+
+def test_empty_histogram_summary():
+    assert LatencyHistogram().summary() == {'count': 0, 'mean_ms': 0, 'p50_ms': 0, 'p95_ms': 0, 'max_ms': 0}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def record_sample(monitor, clock, start, device_timestamp=True):
+    """Walks one sample through every stage, 1 ms apart (inference takes 2 ms)."""
+    sample = HandSample(0.5, 0.5, start, start + 0.001, start + 0.003, device_timestamp)
+    clock.now = start + 0.004
+    monitor.filtered(sample)
+    clock.now = start + 0.005
+    monitor.consumed()
+    clock.now = start + 0.006
+    monitor.presented()
+
+
+def test_monitor_records_every_stage():
+    clock = FakeClock()
+    monitor = LatencyMonitor(clock)
+    for i in range(10):
+        record_sample(monitor, clock, i)
+    summary = monitor.summary()
+    assert summary['total']['count'] == 10
+    assert summary['total']['mean_ms'] == pytest.approx(6)
+    assert summary['inference']['mean_ms'] == pytest.approx(2)
+    assert summary['read_to_inference']['count'] == 0
+
+
+def test_monitor_without_device_timestamp_records_read_time():
+    clock = FakeClock()
+    monitor = LatencyMonitor(clock)
+    record_sample(monitor, clock, 0, device_timestamp=False)
+    assert monitor.summary()['read_to_inference']['count'] == 1
+    assert monitor.summary()['capture_to_inference']['count'] == 0
+
+
+def test_monitor_ignores_samples_that_never_reach_the_screen():
+    clock = FakeClock()
+    monitor = LatencyMonitor(clock)
+    monitor.filtered(HandSample(0.5, 0.5, 0))
+    monitor.presented()
+    assert monitor.summary()['total']['count'] == 0
+    assert monitor.report() == ''
+
+
+def test_report_columns_line_up():
+    clock = FakeClock()
+    monitor = LatencyMonitor(clock)
+    for i in range(50):
+        # Slightly uneven durations give interpolated, unrounded percentiles
+        record_sample(monitor, clock, i + i * 1e-5)
+    lines = monitor.report().splitlines()
+    assert len(lines) > 1
+    assert len({len(line) for line in lines}) == 1
+    assert all(line.endswith('ms') for line in lines[1:])
@@ -0,0 +1,62 @@
+from quality import QualityGovernor
+
+BUDGET = 1 / 60
+
+
+def make_governor(**options):
+    applied = []
+    return QualityGovernor(BUDGET, applied.append, **options), applied
+
+
+def run(governor, work_time, frames):
+    for _ in range(frames):
+        governor.update(work_time)
+
+
+def test_steps_down_one_level_at_a_time_under_pressure():
+    governor, applied = make_governor()
+    run(governor, BUDGET, 60)
+    assert applied == [1]
+    run(governor, BUDGET, 59)
+    assert applied == [1]
+    run(governor, BUDGET, 1)
+    assert applied == [1, 2]
+
+
+def test_stays_at_full_quality_with_headroom():
+    governor, applied = make_governor()
+    run(governor, BUDGET * 0.7, 1000)
+    assert applied == []
+    assert governor.level == 0
+
+
+def test_restores_quality_only_after_a_long_quiet_window():
+    governor, applied = make_governor()
+    run(governor, BUDGET, 60)
+    run(governor, BUDGET * 0.5, 179)
+    assert governor.level == 1
+    run(governor, BUDGET * 0.5, 1)
+    assert applied == [1, 0]
+
+
+def test_skips_levels():
+    governor, applied = make_governor(skip_levels=(1, 2))
+    run(governor, BUDGET, 60)
+    assert applied == [3]
+    run(governor, BUDGET * 0.5, 180)
+    assert applied == [3, 0]
+
+
+def test_never_goes_past_the_last_level():
+    governor, applied = make_governor()
+    run(governor, BUDGET * 2, 5000)
+    assert governor.level == len(QualityGovernor.LEVELS) - 1
+    assert applied == list(range(1, len(QualityGovernor.LEVELS)))
+
+
+def test_logs_and_keeps_recent_transitions(capsys):
+    governor, _ = make_governor(history=2)
+    run(governor, BUDGET * 2, 5000)
+    assert len(capsys.readouterr().out.splitlines()) == len(QualityGovernor.LEVELS) - 1
+    assert len(governor.transitions) == 2
+    assert governor.transitions[-1].startswith('reduced_inference -> circle_collisions')
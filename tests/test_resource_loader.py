@@ -0,0 +1,27 @@
+import threading
+from resource_loader import ResourceLoader
+
+
+def test_jobs_run_concurrently_with_one_worker_each():
+    jobs = 5
+    barrier = threading.Barrier(jobs, timeout=5)
+
+    def job(i):
+        # Only finishes once every job is running at the same time
+        barrier.wait()
+        return i
+
+    loader = ResourceLoader(max_workers=jobs)
+    for i in range(jobs):
+        loader.submit(f'job{i}', f'Job {i}', job, i)
+    assert [loader.result(f'job{i}') for i in range(jobs)] == list(range(jobs))
+    assert loader.done() and loader.progress() == 1
+    loader.shutdown()
+
+
+def test_take_forgets_the_job():
+    loader = ResourceLoader()
+    loader.submit('webcam', 'Starting webcam', lambda: 'camera')
+    assert loader.take('webcam') == 'camera'
+    assert loader.take('webcam') is None
+    loader.shutdown()
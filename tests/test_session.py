@@ -0,0 +1,21 @@
+import pygame
+import pytest
+from game_classes import GameState
+from simulation import SimulationClock
+from input_sources import ScriptedInput
+
+
+def make_game():
+    from game import Game
+
+    clock = SimulationClock()
+    return Game(headless=True, seed=1, clock=clock, input_source=ScriptedInput(clock))
+
+
+def test_closing_the_loading_screen_exits():
+    game = make_game()
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    game.run_loading()
+    assert game.game_state == GameState.EXIT
+    with pytest.raises(SystemExit):
+        game.cleanup_and_exit()
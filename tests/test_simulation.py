@@ -0,0 +1,42 @@
+import pytest
+from simulation import SimulationClock
+from input_sources import ScriptedInput
+
+FRAMES = 3000
+
+
+def run_headless(seed, frames=FRAMES, render=False, quality_level=0, **options):
+    """Runs a headless game with scripted input at a quality level and returns its run_simulation summary."""
+    from game import Game
+
+    clock = SimulationClock()
+    game = Game(headless=True, seed=seed, clock=clock, input_source=ScriptedInput(clock), **options)
+    try:
+        game.apply_quality(quality_level)
+        return game.run_simulation(frames, render=render)
+    finally:
+        game.loader.shutdown()
+        game.high_scores.close()
+
+
+@pytest.mark.parametrize('seed', [3, 5])
+@pytest.mark.parametrize('quality_level', [0, 1, 5])
+def test_entity_store_matches_sprites(seed, quality_level):
+    store = run_headless(seed, quality_level=quality_level, entity_store=True)
+    assert store == run_headless(seed, quality_level=quality_level)
+    assert store['health'] < 100  # The run has to exercise collisions to compare anything
+
+
+def test_entity_store_renders_like_sprites():
+    assert run_headless(3, render=True, entity_store=True) == run_headless(3, render=True)
+
+
+@pytest.mark.parametrize('options', [{}, {'hand_filter': 'kalman'}, {'render_scale': 0.5}])
+def test_same_seed_gives_same_results(options):
+    first = run_headless(7, render=True, **options)
+    assert first == run_headless(7, render=True, **options)
+    assert first['frames'] == FRAMES
+
+
+def test_different_seeds_give_different_results():
+    assert run_headless(7) != run_headless(8)
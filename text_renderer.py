@@ -0,0 +1,70 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextRenderer:
+    """
+    Renders plain or outlined text into a single Surface cached by string, font, colors and outline width.
+    The least recently used Surfaces are evicted once max_entries is reached.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color=(255, 255, 255), outline_color=None, outline_width=0):
+        """Returns the cached Surface for the text, composing it on first use."""
+        key = (text, font, tuple(color), outline_color and tuple(outline_color), outline_width)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.compose(text, font, color, outline_color, outline_width)
+        self.cache[key] = surface
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return surface
+
+    @staticmethod
+    def compose(text, font, color, outline_color, outline_width):
+        """Draws the text over eight offset copies in the outline color, like the original border effect."""
+        text_surface = font.render(text, True, color)
+        if not outline_width or outline_color is None:
+            return text_surface
+
+        border_surface = font.render(text, True, outline_color)
+        width, height = text_surface.get_size()
+        surface = pygame.Surface(
+            (width + 2 * outline_width, height + 2 * outline_width), pygame.SRCALPHA)
+        for dx in (-outline_width, 0, outline_width):
+            for dy in (-outline_width, 0, outline_width):
+                if dx or dy:
+                    surface.blit(border_surface,
+                                 (outline_width + dx, outline_width + dy))
+        surface.blit(text_surface, (outline_width, outline_width))
+        return surface
+
+    def get_rect(self, text, font, **position):
+        """
+        Returns the rect of the text itself (without outline), positioned with keyword arguments
+        such as center=... in the same way as Surface.get_rect.
+        """
+        rect = pygame.Rect((0, 0), font.size(text))
+        for name, value in position.items():
+            setattr(rect, name, value)
+        return rect
+
+    def blit(self, screen, text, font, color=(255, 255, 255), outline_color=None, outline_width=0, **position):
+        """
+        Blits the cached text with its outline around the position given by keyword arguments
+        and returns the screen region drawn.
+        """
+        surface = self.render(text, font, color, outline_color, outline_width)
+        rect = self.get_rect(text, font, **position)
+        offset = outline_width if outline_color is not None else 0
+        return screen.blit(surface, (rect.x - offset, rect.y - offset))